@@ -1,11 +1,14 @@
 # config.py
 import os
-from pydantic import BaseModel
-from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict
+from app.env import load_env
 
-load_dotenv()  # <-- add this line
+load_env()  # no-op if app/__init__ already loaded .env
 
 class Settings(BaseModel):
+    # immutable singleton; read once at import
+    model_config = ConfigDict(frozen=True)
+
     env: str = os.getenv("ENV", "dev")
     database_url: str = os.getenv("DATABASE_URL")
     redis_url: str = os.getenv("REDIS_URL")
@@ -13,6 +16,10 @@ class Settings(BaseModel):
     groq_model: str = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
     tz: str = os.getenv("TZ", "America/Los_Angeles")
     disable_embeddings: bool = os.getenv("DISABLE_EMBEDDINGS", "false").lower() in ("1", "true", "yes")
+    # comma-separated; "*" (default) disables credentialed CORS
+    cors_allowed_origins: list[str] = [
+        o.strip() for o in os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",") if o.strip()
+    ]
 
 settings = Settings()
 
@@ -1,19 +1,75 @@
-from sqlalchemy import create_engine
+import asyncio
+import os
+from typing import AsyncIterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession, async_scoped_session, async_sessionmaker, create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def _is_pgbouncer(url: str) -> bool:
+    u = make_url(url)
+    return u.port == 6432 or "pgbouncer" in (u.host or "") or "pgbouncer" in u.query
+
+_PGBOUNCER = _is_pgbouncer(settings.database_url)
+
+# Pool matrix:
+#   bare Postgres               -> QueuePool + pre_ping=true
+#   PgBouncer (transaction mode) -> QueuePool + pre_ping=false (the SELECT 1 ping
+#                                   leaves server backends "idle in transaction")
+# Size the pool per Uvicorn worker: workers * (pool_size + max_overflow) must stay
+# below the server's max_connections.
+_POOL_KW = dict(
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "60")),
+    pool_timeout=30,
+    pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "false" if _PGBOUNCER else "true").lower()
+    in ("1", "true", "yes"),
+)
+
+# Sync engine: scheduler, harvest services and Celery workers
+engine = create_engine(settings.database_url, **_POOL_KW)
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
 )
 
+def _async_url(url: str) -> str:
+    # postgresql:// / postgresql+psycopg:// -> postgresql+asyncpg://
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+# Async engine: request handlers (keeps the event loop free during DB waits)
+async_engine = create_async_engine(
+    _async_url(settings.database_url),
+    # PgBouncer transaction pooling can't keep asyncpg's named prepared statements
+    connect_args={"statement_cache_size": 0} if _PGBOUNCER else {},
+    **_POOL_KW,
+)
+@event.listens_for(async_engine.sync_engine, "connect")
+def _numeric_as_float(dbapi_conn, _record):
+    # decode NUMERIC (salary_min/max) straight to float instead of Decimal
+    dbapi_conn.run_async(
+        lambda conn: conn.set_type_codec(
+            "numeric", encoder=str, decoder=float, schema="pg_catalog", format="text"
+        )
+    )
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+# One session per asyncio task (= per request under uvicorn), so helpers called
+# from a handler can reach the request's session without it being threaded through
+AsyncScopedSession = async_scoped_session(AsyncSessionLocal, scopefunc=asyncio.current_task)
+
 class Base(DeclarativeBase):
     pass
 
 # Dependency
-def get_db():
-    db = SessionLocal()
+async def get_db() -> AsyncIterator[AsyncSession]:
     try:
-        yield db
+        yield AsyncScopedSession()
     finally:
-        db.close()
\ No newline at end of file
+        await AsyncScopedSession.remove()
@@ -1,19 +1,34 @@
 # backend/app/env.py
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from os import environ as env
 from dotenv import load_dotenv, find_dotenv
 
-# Try CWD→parents; if that fails, try repo-root/.env (…/backend/../.env)
-dotenv_path = find_dotenv(usecwd=True)
-if not dotenv_path:
-    repo_root = Path(__file__).resolve().parents[1].parent  # backend/ -> repo root
-    candidate = repo_root / ".env"
-    dotenv_path = str(candidate) if candidate.exists() else ""
+_LOADED = False
 
-# Load only once; do NOT override real environment
-load_dotenv(dotenv_path or None, override=False)
+@lru_cache(maxsize=1)
+def _find_dotenv_path() -> str:
+    # Try CWD→parents; if that fails, try repo-root/.env (…/backend/../.env)
+    path = find_dotenv(usecwd=True)
+    if not path:
+        repo_root = Path(__file__).resolve().parents[1].parent  # backend/ -> repo root
+        candidate = repo_root / ".env"
+        path = str(candidate) if candidate.exists() else ""
+    return path
+
+def load_env() -> str:
+    """Load .env into os.environ once per process; later calls are no-ops."""
+    global _LOADED
+    path = _find_dotenv_path()
+    if not _LOADED:
+        # do NOT override real environment
+        load_dotenv(path or None, override=False)
+        _LOADED = True
+    return path
+
+dotenv_path = load_env()
 
 # tiny helper to check quickly in logs
 def _mask(val: str | None) -> str:
@@ -32,4 +47,4 @@ try:
 except Exception:
     pass
 
-__all__ = ["env"]
+__all__ = ["env", "load_env"]
@@ -1,39 +1,61 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import jobs, analyze, cover_letters
-from app.routers.harvest import router as harvest_router
-import asyncio
-from app.scheduler import start_scheduler
-from app.routers import llm 
-from app.routers import chat
-from app.env import env
-from app.routers import parse_resume
+from fastapi.middleware.gzip import GZipMiddleware
+from app.config import settings
+from app.routers import analyze, chat, cover_letters, harvest, jobs, llm, parse_resume
+from app.scheduler import start_scheduler, stop_scheduler
+from app.services.cache import make_redis
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    key = settings.groq_api_key
+    masked = "missing" if not key else f"{key[:4]}…{key[-4:]}"
+    print(f"[startup] GROQ_API_KEY: {masked}")
 
-app = FastAPI(title="Job Scout Agent")
+    # threadpool behind run_in_threadpool and sync endpoints (anyio default: 40)
+    if os.getenv("THREAD_POOL_SIZE"):
+        anyio.to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("THREAD_POOL_SIZE"))
+
+    # process-wide clients: one connection pool each instead of one per request
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=90,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+    )
+    app.state.redis = make_redis(settings.redis_url)
+    sched = start_scheduler(asyncio.get_running_loop())
+    try:
+        yield
+    finally:
+        stop_scheduler(sched)
+        await app.state.http.aclose()
+        await app.state.redis.aclose()
+
+app = FastAPI(title="Job Scout Agent", lifespan=lifespan)
+# Credentials are only valid with explicit origins; with "*" the middleware
+# can send a static Access-Control-Allow-Origin and skip per-request echoing
+_origins = settings.cors_allowed_origins
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"], allow_credentials=True,
+    allow_origins=_origins, allow_credentials="*" not in _origins,
     allow_methods=["*"], allow_headers=["*"],
 )
+# job lists carry full description_md blobs; markdown compresses ~10x
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 app.include_router(llm.router)
 app.include_router(jobs.router)
 app.include_router(analyze.router)
 app.include_router(cover_letters.router)
-app.include_router(harvest_router)
+app.include_router(harvest.router)
 app.include_router(chat.router)
 app.include_router(parse_resume.router)
 
-@app.on_event("startup")
-async def _startup():
-    key = env.get("GROQ_API_KEY")
-    masked = "missing" if not key else f"{key[:4]}…{key[-4:]}"
-    print(f"[startup] GROQ_API_KEY: {masked}")
-
-@app.on_event("startup")
-async def _on_startup():
-    loop = asyncio.get_event_loop()
-    start_scheduler(loop)
-
 @app.get("/healthz")
 def health():
     return {"status": "ok"}
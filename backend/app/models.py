@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, Text, JSON, Integer, TIMESTAMP, ForeignKey, Numeric, Boolean
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, JSON, Integer, TIMESTAMP, ForeignKey, Numeric, Boolean, Computed, Index, func
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.db import Base
 
 class Job(Base):
@@ -14,17 +14,45 @@ class Job(Base):
     remote = Column(String)
     employment_type = Column(String)
     level = Column(String)
-    posted_at = Column(TIMESTAMP, nullable=False)
+    posted_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     apply_url = Column(Text, nullable=False)
     canonical_url = Column(Text)
     currency = Column(String)
-    salary_min = Column(Numeric)
-    salary_max = Column(Numeric)
+    # fetched as float (asyncpg numeric codec in db.py); no Decimal round-trip
+    salary_min = Column(Numeric(asdecimal=False))
+    salary_max = Column(Numeric(asdecimal=False))
     salary_period = Column(String)
     description_md = Column(Text, nullable=False)
     description_raw = Column(Text)
+    # 64-bit simhash computed client-side (services/dedupe.py): Postgres has no
+    # simhash, and an exact digest column would stop near-duplicate matching
     hash_sim = Column(String, nullable=False)
     meta = Column(JSON)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    # DB-maintained FTS document; deferred so list queries don't ship it
+    search_vec = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(title,'') || ' ' || coalesce(company,'') || ' ' || coalesce(description_md,''))",
+            persisted=True,
+        ),
+    ))
+
+    __table_args__ = (
+        # every list endpoint orders/filters on posted_at
+        Index("ix_jobs_posted_at_desc", posted_at.desc()),
+        Index("ix_jobs_hash_sim", "hash_sim", unique=True),
+        Index("ix_jobs_remote", "remote"),
+        Index("ix_jobs_level", "level"),
+        # ingest's batched URL probe (services/jobs.py)
+        Index("ix_jobs_canonical_url", "canonical_url"),
+        Index("ix_jobs_apply_url", "apply_url"),
+        Index("ix_jobs_fts", "search_vec", postgresql_using="gin"),
+        Index(
+            "ix_jobs_location_trgm", "location",
+            postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
 
     analyses = relationship("JobAnalysis", back_populates="job", cascade="all, delete-orphan")
     letters = relationship("CoverLetter", back_populates="job", cascade="all, delete-orphan")
@@ -39,7 +67,7 @@ class JobAnalysis(Base):
     gaps = Column(JSON)
     ats_keywords = Column(JSON)
     rationale = Column(Text)
-    created_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.now())
 
     job = relationship("Job", back_populates="analyses")
 
@@ -51,7 +79,7 @@ class CoverLetter(Base):
     variant = Column(String)
     tone = Column(String)
     letter_md = Column(Text)
-    created_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.now())
     user_edited = Column(Boolean, default=False)
 
     job = relationship("Job", back_populates="letters")
\ No newline at end of file
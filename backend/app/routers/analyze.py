@@ -1,10 +1,13 @@
 # app/routers/analyze.py (add this alongside /analyze and /cover_letters)
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_db
 from app.models import Job
 from app.config import settings
+from app.routers.chat import AskIn, ask, get_llm
+from app.services.llm_groq import GroqLLM
 
 router = APIRouter(tags=["analyze"])
 
@@ -14,33 +17,28 @@ class QARequest(BaseModel):
     resume_text: str | None = None
 
 @router.post("/qa")
-def qa(req: QARequest, db: Session = Depends(get_db)):
-    job = db.query(Job).filter_by(id=req.job_id).first()
+async def qa(
+    req: QARequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    llm: GroqLLM = Depends(get_llm),
+):
+    res = await db.execute(select(Job).filter_by(id=req.job_id))
+    job = res.scalar_one_or_none()
     if not job:
         raise HTTPException(404, "job not found")
     if not settings.groq_api_key:
         raise HTTPException(400, "GROQ_API_KEY not configured")
 
-    # very small prompt; swap with your prompt lib if you have one
-    from groq import Groq
-    client = Groq(api_key=settings.groq_api_key)
-    system = "You are a helpful assistant that answers questions about a job description."
-    user = f"""JOB TITLE: {job.title}
+    # same prompt/session/cache path as /chat/ask, so follow-ups can send session_id
+    job_md = f"""JOB TITLE: {job.title}
 COMPANY: {job.company}
 LOCATION: {job.location or 'N/A'}
 
-JOB DESCRIPTION (Markdown/HTML):
-{job.description_md}
-
-RESUME (optional):
-{req.resume_text or '(none)'}
-
-QUESTION:
-{req.question}
-"""
-    resp = client.chat.completions.create(
-        model=settings.groq_model,
-        messages=[{"role":"system","content":system},{"role":"user","content":user}],
-        temperature=0.2,
+{job.description_md}"""
+    out = await ask(
+        AskIn(job_md=job_md, resume_md=req.resume_text or "(none)", question=req.question),
+        request,
+        llm,
     )
-    return {"answer": resp.choices[0].message.content.strip()}
+    return {"answer": out.answer, "session_id": out.session_id}
@@ -1,20 +1,32 @@
 # backend/app/routers/chat.py
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Literal, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Literal, Optional, Dict, Any, Tuple
 import httpx
+import orjson
 
-from app.services.llm_groq import GroqLLM
+from app.services import cache
+from app.services.llm_groq import GroqLLM, GROQ_MODEL
 
 router = APIRouter(prefix="/chat", tags=["chat"])
-_llm = GroqLLM()
+
+_ASK_TTL = 3600
+_SESSION_TTL = 6 * 3600
+
+def get_llm(request: Request) -> GroqLLM:
+    # reuse the keep-alive pool opened in main.lifespan
+    return GroqLLM(client=request.app.state.http)
 
 class AskIn(BaseModel):
-    # Pass the job description (markdown or text) and resume text from the FE
-    job_md: str = Field(..., description="Full job description text/markdown")
-    resume_md: str = Field(..., description="Parsed resume in text/markdown")
+    # Pass the job description (markdown or text) and resume text from the FE once;
+    # follow-up questions can send just `session_id` + `question`
+    job_md: Optional[str] = Field(None, description="Full job description text/markdown")
+    resume_md: Optional[str] = Field(None, description="Parsed resume in text/markdown")
     question: str = Field(..., description="User's question to the bot")
+    session_id: Optional[str] = Field(None, description="Returned by a previous /ask; reuses its JD + resume")
 
 class AskOut(BaseModel):
     answer: str
@@ -22,6 +34,7 @@ class AskOut(BaseModel):
     matches: List[str] = []
     gaps: List[str] = []
     suggestions: List[str] = []
+    session_id: Optional[str] = None
 
 def _system_prompt(job_md: str, resume_md: str) -> str:
     return (
@@ -40,6 +53,13 @@ def _system_prompt(job_md: str, resume_md: str) -> str:
         f"{resume_md}\n"
     )
 
+@lru_cache(maxsize=128)
+def _session_for(job_md: str, resume_md: str) -> Tuple[str, str]:
+    # multi-turn chats resend the same JD/resume: skip rebuilding and
+    # re-digesting the (often ~70KB) prompt on every turn
+    prompt = _system_prompt(job_md, resume_md)
+    return cache.digest(prompt)[:32], prompt
+
 def _fallback_json(text: str) -> Dict[str, Any]:
     # Extremely defensive: if model returns non-JSON, wrap it.
     return {
@@ -50,32 +70,10 @@ def _fallback_json(text: str) -> Dict[str, Any]:
         "suggestions": [],
     }
 
-@router.post("/ask", response_model=AskOut)
-async def ask(body: AskIn) -> AskOut:
-    if not body.job_md.strip() or not body.resume_md.strip():
-        raise HTTPException(400, detail="job_md and resume_md are required")
-
-    sys = {"role": "system", "content": _system_prompt(body.job_md, body.resume_md)}
-    user = {"role": "user", "content": body.question.strip()}
-
-    try:
-        # Ask the model for strict JSON. (OpenAI-compatible flag is supported by Groq.)
-        reply_text = await _llm.chat(
-            [sys, user],
-            temperature=0.2,
-            response_format={"type": "json_object"},  # ask for JSON
-        )
-    except httpx.HTTPStatusError as e:
-        status = e.response.status_code if e.response is not None else 500
-        text = e.response.text if e.response is not None else str(e)
-        raise HTTPException(500, detail=f"Groq error {status}: {text}")
-    except Exception as e:
-        raise HTTPException(500, detail=str(e))
-
+def _parse_reply(reply_text: str) -> AskOut:
     # Parse JSON safely
-    import json
     try:
-        data = json.loads(reply_text)
+        data = orjson.loads(reply_text)
         # normalize/validate
         answer = str(data.get("answer", "")).strip()
         score = int(data.get("score", 0))
@@ -91,3 +89,90 @@ async def ask(body: AskIn) -> AskOut:
     except Exception:
         f = _fallback_json(reply_text)
         return AskOut(**f)
+
+async def _session_prompt(request: Request, body: AskIn) -> Tuple[str, str]:
+    """
+    Resolve (session_id, system prompt). The prompt is stored in Redis under a
+    digest of itself, so every turn of a session sends a byte-identical system
+    prefix (what Groq's prompt cache keys on) without the client reshipping it.
+    """
+    r = getattr(request.app.state, "redis", None)
+    if (body.job_md or "").strip() and (body.resume_md or "").strip():
+        sid, prompt = _session_for(body.job_md, body.resume_md)
+        await cache.set_bytes(r, f"chat:session:{sid}", prompt.encode(), _SESSION_TTL)
+        return sid, prompt
+    if body.session_id:
+        hit = await cache.get_bytes(r, f"chat:session:{body.session_id}")
+        if hit is not None:
+            return body.session_id, hit.decode()
+        raise HTTPException(404, detail="chat session expired; resend job_md and resume_md")
+    raise HTTPException(400, detail="job_md and resume_md are required")
+
+@router.post("/ask", response_model=AskOut)
+async def ask(body: AskIn, request: Request, llm: GroqLLM = Depends(get_llm)) -> AskOut:
+    sid, prompt = await _session_prompt(request, body)
+
+    # identical (jd, resume, question) tuples are answered from Redis
+    r = getattr(request.app.state, "redis", None)
+    key = "cache:ask:" + cache.digest(sid, body.question.strip(), GROQ_MODEL)
+    hit = await cache.get_bytes(r, key)
+    if hit is not None:
+        return AskOut.model_validate_json(hit)
+
+    sys = {"role": "system", "content": prompt}
+    user = {"role": "user", "content": body.question.strip()}
+
+    try:
+        # Ask the model for strict JSON. (OpenAI-compatible flag is supported by Groq.)
+        reply_text = await llm.chat(
+            [sys, user],
+            temperature=0.2,
+            response_format={"type": "json_object"},  # ask for JSON
+        )
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code if e.response is not None else 500
+        text = e.response.text if e.response is not None else str(e)
+        raise HTTPException(500, detail=f"Groq error {status}: {text}")
+    except Exception as e:
+        raise HTTPException(500, detail=str(e))
+
+    out = _parse_reply(reply_text)
+    out.session_id = sid
+    await cache.set_bytes(r, key, out.model_dump_json().encode(), _ASK_TTL, nx=True)
+    return out
+
+@router.post("/ask/stream")
+async def ask_stream(
+    body: AskIn, request: Request, llm: GroqLLM = Depends(get_llm)
+) -> StreamingResponse:
+    """
+    SSE variant of /ask: `data: {"delta": ...}` frames while the model writes,
+    then one `event: done` frame carrying the parsed AskOut.
+    """
+    sid, prompt = await _session_prompt(request, body)
+
+    sys = {"role": "system", "content": prompt}
+    user = {"role": "user", "content": body.question.strip()}
+
+    async def events():
+        parts: List[str] = []
+        try:
+            async for delta in llm.chat_stream(
+                [sys, user],
+                temperature=0.2,
+                response_format={"type": "json_object"},
+            ):
+                parts.append(delta)
+                yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+            return
+        out = _parse_reply("".join(parts))
+        out.session_id = sid
+        yield b"event: done\ndata: " + out.model_dump_json().encode() + b"\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -6,14 +6,17 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
-from sqlalchemy import select, text, and_
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import select, func, and_, delete, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.models import Job
 from app.schemas import JobFilter
+from app.services import cache
 from app.services.dedupe import simhash_text
 from app.services.jobs import delete_older_than_hours
 
@@ -44,27 +47,49 @@ class JobCreate(BaseModel):
     meta: dict | None = None
 
 
-def _serialize_job(j: Job) -> dict:
-    return {
-        "id": str(j.id),
-        "source": j.source,
-        "company": j.company,
-        "title": j.title,
-        "location": j.location,
-        "remote": j.remote,
-        "employment_type": j.employment_type,
-        "level": j.level,
-        "posted_at": (j.posted_at.isoformat() if isinstance(j.posted_at, datetime) else None),
-        "apply_url": j.apply_url,
-        "canonical_url": j.canonical_url,
-        "currency": j.currency,
-        "salary_min": float(j.salary_min) if j.salary_min is not None else None,
-        "salary_max": float(j.salary_max) if j.salary_max is not None else None,
-        "salary_period": j.salary_period,
-        "description_md": j.description_md,
-        "description_raw": j.description_raw,
-        "created_at": (j.created_at.isoformat() if getattr(j, "created_at", None) else None),
-    }
+class JobOut(BaseModel):
+    # serialized straight from ORM rows by pydantic-core
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    source: str
+    company: str
+    title: str
+    location: str | None = None
+    remote: str | None = None
+    employment_type: str | None = None
+    level: str | None = None
+    posted_at: datetime | None = None
+    apply_url: str
+    canonical_url: str | None = None
+    currency: str | None = None
+    salary_min: float | None = None
+    salary_max: float | None = None
+    salary_period: str | None = None
+    description_md: str
+    description_raw: str | None = None
+    created_at: datetime | None = None
+
+
+_JOB_LIST = TypeAdapter(list[JobOut])
+_LIST_TTL = 30  # seconds; ingest/cleanup bust the namespace explicitly
+
+
+async def _cached_job_list(request: Request, db: AsyncSession, stmt, *key_parts) -> Response:
+    """Serve a read-mostly job list from Redis, filling it from `stmt` on a miss."""
+    r = getattr(request.app.state, "redis", None)
+    key = await cache.ns_key(r, cache.JOBS_NS, *key_parts)
+    body = await cache.get_bytes(r, key)
+    if body is None:
+        rows = (await db.execute(stmt)).scalars().all()
+        body = _JOB_LIST.dump_json(_JOB_LIST.validate_python(rows, from_attributes=True))
+        await cache.set_bytes(r, key, body, _LIST_TTL)
+    # anonymous reads: let an edge/shared cache absorb them for the same window
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={_LIST_TTL}"},
+    )
 
 
 # ----------------------------
@@ -72,14 +97,12 @@ def _serialize_job(j: Job) -> dict:
 # ----------------------------
 
 @router.post("/ingest")
-def ingest_job(payload: JobCreate, db: Session = Depends(get_db)):
-    # idempotent insert using a stable fingerprint over content
-    h = simhash_text(payload.description_md)
-    existing = db.query(Job).filter(Job.hash_sim == h).first()
-    if existing:
-        return {"id": str(existing.id), "status": "exists"}
-
-    job = Job(
+async def ingest_job(payload: JobCreate, request: Request, db: AsyncSession = Depends(get_db)):
+    # idempotent insert using a stable fingerprint over content;
+    # ON CONFLICT on the unique hash_sim index makes it one race-free roundtrip.
+    # Simhash is a pure-CPU pass over the description: keep it off the event loop.
+    h = await run_in_threadpool(simhash_text, payload.description_md)
+    ins = pg_insert(Job).values(
         source=payload.source,
         company=payload.company,
         title=payload.title,
@@ -99,11 +122,29 @@ def ingest_job(payload: JobCreate, db: Session = Depends(get_db)):
         hash_sim=h,
         meta=payload.meta or {},
     )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    return {"id": str(job.id), "status": "created"}
-
+    new_id = (await db.execute(
+        ins.on_conflict_do_nothing(index_elements=[Job.hash_sim]).returning(Job.id)
+    )).scalar_one_or_none()
+    existing_id = None
+    if new_id is None:
+        existing_id = (
+            await db.execute(select(Job.id).where(Job.hash_sim == h).limit(1))
+        ).scalar_one_or_none()
+        if existing_id is None:
+            # the conflicting row was deleted (e.g. /jobs/cleanup) after our insert:
+            # retry with a no-op DO UPDATE, which returns the id either way
+            new_id, created = (await db.execute(
+                ins.on_conflict_do_update(
+                    index_elements=[Job.hash_sim], set_={"hash_sim": ins.excluded.hash_sim}
+                ).returning(Job.id, literal_column("(xmax = 0)"))
+            )).one()
+            if not created:
+                new_id, existing_id = None, new_id
+    await db.commit()
+    if new_id is not None:
+        await cache.bump_ns(getattr(request.app.state, "redis", None), cache.JOBS_NS)
+        return {"id": str(new_id), "status": "created"}
+    return {"id": str(existing_id), "status": "exists"}
 
 def _parse_date(d: Optional[str]) -> Optional[datetime]:
     if not d:
@@ -113,16 +154,16 @@ def _parse_date(d: Optional[str]) -> Optional[datetime]:
         if len(d) == 10:
             # naive date -> start of day UTC
             return datetime.fromisoformat(d).replace(tzinfo=timezone.utc)
-        dt = datetime.fromisoformat(d.replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(d)
         return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
     except Exception:
         return None
 
 
-@router.post("/search")
-def search_jobs(
+@router.post("/search", response_model=list[JobOut])
+async def search_jobs(
     filter: JobFilter,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     # query-string overrides (so curl/HTTPie/FE can pass them easily)
     date_from: Optional[str] = Query(None, description="ISO date/time or YYYY-MM-DD"),
     date_to: Optional[str] = Query(None, description="ISO date/time or YYYY-MM-DD"),
@@ -136,7 +177,7 @@ def search_jobs(
         we DO NOT apply `posted_within_hours`.
       - q_limit, q_offset: override pagination.
 
-    Results are ordered by posted_at DESC.
+    Results are ordered by posted_at DESC; with `q`, by full-text rank first.
     """
 
     # resolve pagination
@@ -144,7 +185,8 @@ def search_jobs(
     offset = q_offset if q_offset is not None else getattr(filter, "offset", 0) or 0
     limit = min(max(limit, 1), 500)
 
-    q = select(Job).order_by(Job.posted_at.desc())
+    q = select(Job)
+    order_by = [Job.posted_at.desc()]
 
     # if a date range is supplied, apply it and **ignore** posted_within_hours
     df = _parse_date(date_from)
@@ -174,73 +216,87 @@ def search_jobs(
     if getattr(filter, "location", None):
         q = q.where(Job.location.ilike(f"%{filter.location}%"))
     if getattr(filter, "q", None):
-        q = q.where(
-            text("(title ILIKE :term OR company ILIKE :term OR description_md ILIKE :term)")
-        ).params(term=f"%{filter.q}%")
+        # GIN-indexed tsvector instead of a leading-wildcard ILIKE scan
+        tsq = func.plainto_tsquery("english", filter.q)
+        q = q.where(Job.search_vec.op("@@")(tsq))
+        order_by.insert(0, func.ts_rank_cd(Job.search_vec, tsq).desc())
+
+    res = await db.execute(q.order_by(*order_by).offset(offset).limit(limit))
+    return res.scalars().all()
+
 
-    rows = db.execute(q.offset(offset).limit(limit)).scalars().all()
-    return [_serialize_job(j) for j in rows]
+@router.get("/recent", response_model=list[JobOut])
+async def recent_jobs(request: Request, limit: int = 21, db: AsyncSession = Depends(get_db)):
+    limit = min(max(limit, 1), 200)
+    stmt = select(Job).order_by(Job.posted_at.desc()).limit(limit)
+    return await _cached_job_list(request, db, stmt, "recent", limit)
 
 
-@router.get("/recent")
-def recent_jobs(limit: int = 21, db: Session = Depends(get_db)):
-    rows = (
-        db.query(Job)
-        .order_by(Job.posted_at.desc())
-        .limit(min(max(limit, 1), 200))
-        .all()
+# must stay above /{job_id}, which would otherwise capture "all"
+@router.get("/all", response_model=list[JobOut])
+async def list_all_jobs(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    stmt = (
+        select(Job)
+          .order_by(Job.posted_at.desc())
+          .offset(offset)
+          .limit(limit)
     )
-    return [_serialize_job(j) for j in rows]
+    return await _cached_job_list(request, db, stmt, "all", limit, offset)
 
 
-@router.get("/{job_id}")
-def get_job(job_id: UUID, db: Session = Depends(get_db)):
-    row = db.query(Job).filter(Job.id == job_id).first()
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
+    res = await db.execute(select(Job).where(Job.id == job_id))
+    row = res.scalar_one_or_none()
     if not row:
         raise HTTPException(status_code=404, detail="job not found")
-    return _serialize_job(row)
+    return row
 
 
 # --- Cleanup (manual/admin) ---
 
-@router.delete("/cleanup")
-def cleanup_jobs(ttl_hours: int = Query(48, ge=1, le=24 * 30), db: Session = Depends(get_db)):
+class CleanupOut(BaseModel):
+    deleted: int
+    older_than: datetime
+
+
+@router.delete("/cleanup", response_model=CleanupOut)
+async def cleanup_jobs(
+    request: Request,
+    ttl_hours: int = Query(48, ge=1, le=24 * 30),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Delete jobs with posted_at older than ttl_hours (default 48).
     """
     cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
-    deleted = (
-        db.query(Job)
-        .filter(Job.posted_at < cutoff)
-        .delete(synchronize_session=False)
+    res = await db.execute(
+        delete(Job).where(Job.posted_at < cutoff).execution_options(synchronize_session=False)
     )
-    db.commit()
-    return {"deleted": int(deleted or 0), "older_than": cutoff.isoformat()}
+    await db.commit()
+    await cache.bump_ns(getattr(request.app.state, "redis", None), cache.JOBS_NS)
+    return CleanupOut(deleted=int(res.rowcount or 0), older_than=cutoff)
 
 
 class CleanupIn(BaseModel):
     ttl_hours: int = 48
 
 
-@router.post("/cleanup")
-async def cleanup_jobs_post(payload: CleanupIn):
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=payload.ttl_hours)
-    deleted = await delete_older_than_hours(cutoff)
-    return {"ok": True, "deleted": deleted, "cutoff": cutoff.isoformat()}
-
-@router.get("/all")
-def list_all_jobs(
-    limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-):
-    rows = (
-        db.query(Job)
-          .order_by(Job.posted_at.desc())
-          .offset(offset)
-          .limit(limit)
-          .all()
-    )
-    return [_serialize_job(j) for j in rows]
+class CleanupPostOut(BaseModel):
+    ok: bool = True
+    deleted: int
+    cutoff: datetime
 
 
+@router.post("/cleanup", response_model=CleanupPostOut)
+async def cleanup_jobs_post(payload: CleanupIn, request: Request):
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=payload.ttl_hours)
+    # sync service (own session); keep it off the event loop
+    deleted = await run_in_threadpool(delete_older_than_hours, cutoff)
+    await cache.bump_ns(getattr(request.app.state, "redis", None), cache.JOBS_NS)
+    return CleanupPostOut(deleted=deleted, cutoff=cutoff)
@@ -1,4 +1,9 @@
 # backend/app/routers/llm.py
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 
@@ -19,8 +24,33 @@ class ChatIn(BaseModel):
     resume_text: str
     question: str
 
+# In-process LRU: repeat (job, resume, knobs) requests skip the model call.
+_CACHE: "OrderedDict[Tuple[Hashable, ...], Dict[str, Any]]" = OrderedDict()
+_CACHE_MAX = 1024
+_CACHE_LOCK = threading.Lock()  # sync handlers run on the threadpool
+
+def _resume_hash(resume_text: str) -> str:
+    return hashlib.blake2b(resume_text.encode(), digest_size=16).hexdigest()
+
+def _cached(key: Tuple[Hashable, ...], compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+            return hit
+    val = compute()
+    with _CACHE_LOCK:
+        _CACHE[key] = val
+        if len(_CACHE) > _CACHE_MAX:
+            _CACHE.popitem(last=False)
+    return val
+
 @router.post("/analyze")
 def analyze(body: AnalyzeIn):
+    key = ("analyze", body.job_id, _resume_hash(body.resume_text))
+    return _cached(key, lambda: _analyze(body))
+
+def _analyze(body: AnalyzeIn) -> Dict[str, Any]:
     # TODO: call your model here
     return {
         "fit_score": 72,
@@ -32,6 +62,10 @@ def analyze(body: AnalyzeIn):
 
 @router.post("/cover_letters")
 def cover(body: CoverIn):
+    key = ("cover", body.job_id, _resume_hash(body.resume_text), body.variant, body.tone)
+    return _cached(key, lambda: _cover(body))
+
+def _cover(body: CoverIn) -> Dict[str, Any]:
     # TODO: call your model here
     return {
         "letter_md": f"""Dear Hiring Team,
@@ -44,5 +78,9 @@ You"""
 
 @router.post("/chat")
 def chat(body: ChatIn):
+    key = ("chat", body.job_id, _resume_hash(body.resume_text), body.question.strip())
+    return _cached(key, lambda: _chat(body))
+
+def _chat(body: ChatIn) -> Dict[str, Any]:
     # TODO: call your model here
     return { "answer": f"(stub) Q: {body.question}\nGiven your resume, you’d be a strong fit for the modeling portions." }
@@ -1,10 +1,12 @@
 # server/routes_parse.py
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Literal
 import io, re
 
 # Lightweight parsers
-from PyPDF2 import PdfReader
+import pymupdf  # MuPDF (C) text extraction
+from PyPDF2 import PdfReader  # pure-Python fallback for PDFs MuPDF rejects
 from docx import Document  # python-docx
 try:
     from unidecode import unidecode  # better ASCII-ization
@@ -13,32 +15,58 @@ except Exception:
 
 router = APIRouter(prefix="/parse", tags=["parse"])
 
+_RE_CTRL = re.compile(r"[^\x09\x0A\x0D\x20-\x7E]")  # keep tabs/newlines/printables
+# Same mapping as _RE_CTRL for ASCII input, applied by str.translate's C loop
+_CTRL_TABLE = {c: 0x20 for c in range(128) if c not in (9, 10, 13) and not 0x20 <= c <= 0x7E}
+_RE_WS = re.compile(r"[ \t]{2,}")
+_RE_NL = re.compile(r"\n{3,}")
+
 def _clean_text(text: str) -> str:
     # Normalize unicode → ASCII-ish for ATS friendliness
     if unidecode:
         text = unidecode(text)
     # Collapse control chars & binary noise
-    text = re.sub(r"[^\x09\x0A\x0D\x20-\x7E]", " ", text)  # keep tabs/newlines/printables
+    if text.isascii():  # always true after unidecode
+        text = text.translate(_CTRL_TABLE)
+    else:
+        text = _RE_CTRL.sub(" ", text)
     # Collapse excessive whitespace
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_WS.sub(" ", text)
+    text = _RE_NL.sub("\n\n", text)
     return text.strip()
 
+def _join_pages(texts) -> str:
+    # pages go into one buffer as they are extracted, instead of a list of
+    # page strings living alongside their joined copy
+    buf = io.StringIO()
+    for i, t in enumerate(texts):
+        if i:
+            buf.write("\n\n")
+        buf.write(t)
+    return buf.getvalue()
+
 def _read_pdf(file: UploadFile) -> str:
+    # MuPDF needs the whole document as one buffer; read it once and share it
+    file.file.seek(0)
     data = file.file.read()
+    try:
+        with pymupdf.open(stream=data, filetype="pdf") as doc:
+            return _join_pages(page.get_text() for page in doc)
+    except Exception:
+        pass
     try:
         reader = PdfReader(io.BytesIO(data))
-        pages = []
-        for p in reader.pages:
-            pages.append(p.extract_text() or "")
-        return "\n\n".join(pages)
+        return _join_pages(p.extract_text() or "" for p in reader.pages)
     except Exception as e:
         # Fallback: return bytes as text if extraction fails (still cleaned later)
         return data.decode("utf-8", errors="ignore")
 
-def _read_docx(data: bytes) -> str:
-    bio = io.BytesIO(data)
-    doc = Document(bio)
+# UploadFile's SpooledTemporaryFile goes straight to python-docx: no extra
+# bytes + BytesIO copy, and large uploads stay spooled on disk.
+
+def _read_docx(file: UploadFile) -> str:
+    file.file.seek(0)
+    doc = Document(file.file)
     return "\n".join(p.text for p in doc.paragraphs)
 
 @router.post("/resume")
@@ -46,10 +74,11 @@ async def parse_resume(file: UploadFile = File(...)):
     name = (file.filename or "").lower()
 
     try:
+        # parsing is CPU-bound; keep it off the event loop
         if name.endswith(".pdf"):
-            raw = _read_pdf(file)
+            raw = await run_in_threadpool(_read_pdf, file)
         elif name.endswith(".docx"):
-            raw = _read_docx(await file.read())
+            raw = await run_in_threadpool(_read_docx, file)
         elif name.endswith(".txt") or not name:
             raw = (await file.read()).decode("utf-8", errors="ignore")
         else:
@@ -59,7 +88,7 @@ async def parse_resume(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse: {e}")
 
-    cleaned = _clean_text(raw or "")
+    cleaned = await run_in_threadpool(_clean_text, raw or "")
     if not cleaned:
         raise HTTPException(status_code=422, detail="No readable text found in document.")
 
@@ -4,6 +4,8 @@ from __future__ import annotations
 import os
 import asyncio
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -29,14 +31,10 @@ def _parse_cron(expr: str) -> CronTrigger:
     minute, hour, day, month, dow = expr.split()
     return CronTrigger(minute=minute, hour=hour, day=day, month=month, day_of_week=dow, timezone="UTC")
 
-def _harvest_sync():
+def _harvest_sync(sources: List[str], ashby_orgs: List[str], greenhouse_orgs: List[str]):
     """
-    Runs a single harvest sweep, reading ALL parameters from env.
+    Runs a single harvest sweep with the env config resolved in start_scheduler.
     """
-    sources = _env_list("HARVEST_SOURCES")  # e.g. "ashby,greenhouse"
-    ashby_orgs = _env_list("ASHBY_ORGS")  # e.g. "roblox,togetherai"
-    greenhouse_orgs = _env_list("GREENHOUSE_ORGS")  # e.g. "databricks,snowflake"
-
     with SessionLocal() as db:
         try:
             res = harvest_once(
@@ -49,26 +47,43 @@ def _harvest_sync():
         except Exception:
             log.exception("Harvest run failed")
 
-def _cleanup_sync():
-    ttl_hours = int(os.getenv("JOB_TTL_HOURS", "48"))  # default 2 days
+def _cleanup_sync(ttl_hours: int):
     try:
         deleted = cleanup_old_jobs(ttl_hours)
         log.info("Cleanup completed: deleted=%s (ttl=%sh)", deleted, ttl_hours)
     except Exception:
         log.exception("Cleanup run failed")
 
-async def _harvest_async():
+_HARVEST_POOL: Optional[ProcessPoolExecutor] = None
+
+def _harvest_pool() -> ProcessPoolExecutor:
+    """
+    Harvest parsing is CPU-bound, so it runs in its own process instead of the
+    GIL-shared default thread pool. "spawn" gives each worker a fresh interpreter:
+    its own engine/SessionLocal and httpx client, no inherited sockets or threads.
+    APScheduler never overlaps runs of one job, so one worker is the default.
+    """
+    global _HARVEST_POOL
+    if _HARVEST_POOL is None:
+        _HARVEST_POOL = ProcessPoolExecutor(
+            max_workers=int(os.getenv("HARVEST_WORKERS", "1")),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _HARVEST_POOL
+
+async def _harvest_async(*config):
     loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, _harvest_sync)
+    # config travels as arguments: module state doesn't reach a spawned worker
+    await loop.run_in_executor(_harvest_pool(), _harvest_sync, *config)
 
-async def _cleanup_async():
+async def _cleanup_async(ttl_hours: int):
     loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, _cleanup_sync)
+    await loop.run_in_executor(None, _cleanup_sync, ttl_hours)
 
 def start_scheduler(loop):
     """
     Bootstraps AsyncIOScheduler using CRON from env.
-    Pulls sources/orgs/ttl entirely from env variables:
+    Pulls sources/orgs/ttl from env variables once, here; jobs don't re-read env per tick:
       HARVEST_ENABLED=true|false
       HARVEST_INTERVAL_CRON="*/30 * * * *"
       HARVEST_SOURCES="ashby,greenhouse"
@@ -82,22 +97,32 @@ def start_scheduler(loop):
     # Harvest job
     if _env_bool("HARVEST_ENABLED", "false"):
         cron = os.getenv("HARVEST_INTERVAL_CRON", "*/30 * * * *")  # every 30 minutes by default
-        sched.add_job(_harvest_async, _parse_cron(cron))
+        harvest_config = (
+            _env_list("HARVEST_SOURCES"),   # e.g. "ashby,greenhouse"
+            _env_list("ASHBY_ORGS"),        # e.g. "roblox,togetherai"
+            _env_list("GREENHOUSE_ORGS"),   # e.g. "databricks,snowflake"
+        )
+        sched.add_job(_harvest_async, _parse_cron(cron), args=harvest_config)
         log.info("Harvest scheduled: %s", cron)
     else:
         log.info("Harvest disabled via HARVEST_ENABLED")
 
     # Cleanup job
     cleanup_cron = os.getenv("CLEANUP_INTERVAL_CRON", "0 * * * *")  # top of every hour by default
-    sched.add_job(_cleanup_async, _parse_cron(cleanup_cron))
-    log.info(
-        "Cleanup scheduled: %s (ttl=%sh)",
-        cleanup_cron,
-        os.getenv("JOB_TTL_HOURS", "48"),
-    )
+    ttl_hours = int(os.getenv("JOB_TTL_HOURS", "48"))  # default 2 days
+    sched.add_job(_cleanup_async, _parse_cron(cleanup_cron), args=(ttl_hours,))
+    log.info("Cleanup scheduled: %s (ttl=%sh)", cleanup_cron, ttl_hours)
 
     sched.start()
     log.info("Scheduler started")
+    return sched
+
+def stop_scheduler(sched) -> None:
+    global _HARVEST_POOL
+    sched.shutdown(wait=False)
+    if _HARVEST_POOL is not None:
+        _HARVEST_POOL.shutdown(wait=False, cancel_futures=True)
+        _HARVEST_POOL = None
 
 # from __future__ import annotations
 # import os, asyncio, logging
@@ -0,0 +1,35 @@
+from __future__ import annotations
+import os
+import time
+from collections import OrderedDict
+
+class SeenCache:
+    """
+    Bounded TTL set of postings already harvested. Module-level instance below
+    so it survives across scheduler ticks; single event loop, so no locking.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._exp: "OrderedDict[str, float]" = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        exp = self._exp.get(key)
+        if exp is None:
+            return False
+        if exp < time.monotonic():
+            del self._exp[key]
+            return False
+        return True
+
+    def add(self, key: str) -> None:
+        self._exp[key] = time.monotonic() + self._ttl
+        self._exp.move_to_end(key)
+        while len(self._exp) > self._maxsize:
+            self._exp.popitem(last=False)
+
+seen = SeenCache(
+    maxsize=int(os.getenv("HARVEST_SEEN_MAX", "50000")),
+    ttl=float(os.getenv("HARVEST_SEEN_TTL_SECS", "86400")),
+)
@@ -1,24 +1,68 @@
 from __future__ import annotations
-from typing import AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import abc
-import re
+import asyncio
+from functools import lru_cache
 
 def norm_space(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    # split() collapses whitespace runs in C; no regex engine per title
+    return " ".join(s.split()) if s else ""
 
+# boards repeat the same timestamps across postings; datetimes are immutable
+@lru_cache(maxsize=8192)
 def parse_iso_dt(s: str) -> Optional[datetime]:
     try:
-        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(s)
         return dt.astimezone(timezone.utc)
     except Exception:
         return None
 
-class HarvestResult(Dict):
-    """Fields must match IngestJob schema keys."""
-    pass
+@dataclass(slots=True, kw_only=True)
+class HarvestResult:
+    """
+    One scraped posting. Fields must match IngestJob schema keys; slotted so a
+    large harvest doesn't carry a 17-key dict per posting.
+    """
+    company: str
+    title: str
+    source: str
+    apply_url: Optional[str]
+    canonical_url: Optional[str] = None
+    description_md: str = ""
+    description_raw: Optional[str] = None
+    location: Optional[str] = None
+    remote: Optional[str] = None
+    employment_type: Optional[str] = None
+    level: Optional[str] = None
+    posted_at: Optional[datetime | str] = None
+    currency: Optional[str] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_period: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    hash_sim: Optional[str] = None  # precomputed fingerprint (services.jobs.fingerprint_items)
+
+    def as_dict(self) -> Dict[str, Any]:
+        # for dict-based consumers (services.jobs.upsert_jobs, /jobs/ingest payloads)
+        return {k: getattr(self, k) for k in self.__slots__}
+
+async def fan_out(
+    fn: Callable[[str], Awaitable[List[HarvestResult]]], keys: Iterable[str]
+) -> AsyncIterator[HarvestResult]:
+    """Run fn(key) for every org/board concurrently; yield results in key order."""
+    for batch in await asyncio.gather(*(fn(k) for k in keys)):
+        for r in batch:
+            yield r
 
 class Scraper(abc.ABC):
+    """
+    Async board scraper. harvest() is a chain of small coroutine hops over
+    sockets, so drive it from a uvloop loop: the API already runs on one
+    (uvicorn --loop uvloop), and a standalone runner should call
+    uvloop.install() before asyncio.run().
+    """
     name: str
 
     @abc.abstractmethod
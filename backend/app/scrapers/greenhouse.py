@@ -1,9 +1,11 @@
 from __future__ import annotations
+import asyncio
 import os
 from typing import AsyncIterator, Optional, List
 from datetime import datetime, timezone, timedelta
-from .base import Scraper, HarvestResult, norm_space, parse_iso_dt
+from .base import Scraper, HarvestResult, fan_out, norm_space, parse_iso_dt
 from .http import client, get_json
+from ._seen import seen
 
 def _boards() -> List[str]:
     # Comma-separated slugs, e.g. "stripe,notion,snowflake,databricks"
@@ -18,43 +20,55 @@ class GreenhouseScraper(Scraper):
 
     async def harvest(self, *, query: Optional[str], window_hours: int) -> AsyncIterator[HarvestResult]:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=window_hours)
+        q_lower = query.lower() if query else None
         async with client() as c:
-            for board in _boards():
+            async def _one_board(board: str) -> List[HarvestResult]:
+                out: List[HarvestResult] = []
                 url = f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs"
                 data = await get_json(c, url, ok_statuses=(200, 404))
                 if not data or "jobs" not in data:
                     # 404 or unexpected shape => skip this board
-                    continue
+                    return out
+                # first pass: filter cheaply, then fetch all details concurrently
+                # (get_json's semaphore bounds in-flight requests)
+                candidates = []
                 for j in data.get("jobs", []):
                     posted = parse_iso_dt(j.get("updated_at") or j.get("created_at"))
                     if posted and posted < cutoff:
                         continue
                     title = norm_space(j.get("title"))
-                    if query and query.lower() not in title.lower():
+                    if q_lower and q_lower not in title.lower():
                         continue
                     jid = j.get("id")
-                    detail = await get_json(c, f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{jid}", ok_statuses=(200, 404))
+                    # skip the per-job detail fetch for postings already harvested;
+                    # updated_at in the key lets edited postings through again
+                    key = f"greenhouse:{board}:{jid}:{j.get('updated_at')}"
+                    if key in seen:
+                        continue
+                    candidates.append((j, jid, title, posted, key))
+                details = await asyncio.gather(*[
+                    get_json(c, f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{jid}", ok_statuses=(200, 404))
+                    for _, jid, _, _, _ in candidates
+                ])
+                for (j, jid, title, posted, key), detail in zip(candidates, details):
                     if not detail:
                         continue
+                    seen.add(key)
                     desc = detail.get("content") or ""
                     apply_url = detail.get("absolute_url") or j.get("absolute_url")
                     location = (detail.get("location") or {}).get("name")
-                    yield HarvestResult({
-                        "company": board,
-                        "title": title,
-                        "location": location,
-                        "remote": None,
-                        "employment_type": None,
-                        "level": None,
-                        "posted_at": (posted.isoformat().replace("+00:00","Z") if posted else None),
-                        "apply_url": apply_url,
-                        "canonical_url": detail.get("absolute_url"),
-                        "currency": None,
-                        "salary_min": None,
-                        "salary_max": None,
-                        "salary_period": None,
-                        "description_md": desc,
-                        "description_raw": None,
-                        "source": f"greenhouse:{board}",
-                        "meta": {"job_id": jid},
-                    })
+                    out.append(HarvestResult(
+                        company=board,
+                        title=title,
+                        location=location,
+                        posted_at=(posted.isoformat().replace("+00:00","Z") if posted else None),
+                        apply_url=apply_url,
+                        canonical_url=detail.get("absolute_url"),
+                        description_md=desc,
+                        source=f"greenhouse:{board}",
+                        meta={"job_id": jid},
+                    ))
+                return out
+
+            async for r in fan_out(_one_board, _boards()):
+                yield r
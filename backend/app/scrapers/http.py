@@ -1,15 +1,36 @@
 from __future__ import annotations
 import os, asyncio, logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import httpx
+import orjson
 
 log = logging.getLogger("scraper-http")
 
 _TIMEOUT = float(os.getenv("HARVEST_TIMEOUT_SECS", "20"))
 _PROXY = os.getenv("HARVEST_PROXY") or None
-_LIMIT = int(os.getenv("HARVEST_MAX_CONCURRENCY", "6"))
+_LIMIT = int(os.getenv("HARVEST_MAX_CONCURRENCY", "16"))
 
 _sem = asyncio.Semaphore(_LIMIT)
 
+# url -> (conditional-GET headers, decoded body). Boards rarely change between
+# ticks; a 304 costs headers only and skips the decode.
+_VALIDATORS_MAX = int(os.getenv("HARVEST_ETAG_CACHE_MAX", "4096"))
+_validated: "OrderedDict[str, Tuple[Dict[str, str], dict]]" = OrderedDict()
+
+def _remember(url: str, r: httpx.Response, data: dict) -> None:
+    cond: Dict[str, str] = {}
+    if r.headers.get("etag"):
+        cond["If-None-Match"] = r.headers["etag"]
+    if r.headers.get("last-modified"):
+        cond["If-Modified-Since"] = r.headers["last-modified"]
+    if not cond:
+        return
+    _validated[url] = (cond, data)
+    _validated.move_to_end(url)
+    while len(_validated) > _VALIDATORS_MAX:
+        _validated.popitem(last=False)
+
 # Detect HTTP/2 support
 try:
     import h2  # type: ignore
@@ -31,11 +52,19 @@ def client() -> httpx.AsyncClient:
 async def get_json(c: httpx.AsyncClient, url: str, ok_statuses=(200,)) -> dict:
     async with _sem:
         try:
-            r = await c.get(url)
+            cached: Optional[Tuple[Dict[str, str], dict]] = _validated.get(url)
+            r = await c.get(url, headers=cached[0] if cached else None)
+            if r.status_code == 304 and cached:
+                _validated.move_to_end(url)
+                return cached[1]
             if r.status_code not in ok_statuses:
                 log.info("GET %s -> %s; tolerated=%s", url, r.status_code, ok_statuses)
                 return {}
-            return r.json()
+            # multi-MB board payloads: orjson decodes several times faster than stdlib json
+            data = orjson.loads(r.content)
+            if r.status_code == 200:
+                _remember(url, r, data)
+            return data
         except Exception as e:
             log.warning("GET JSON failed %s: %s", url, e)
             return {}
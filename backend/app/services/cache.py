@@ -0,0 +1,66 @@
+# backend/app/services/cache.py
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+log = logging.getLogger("cache")
+
+JOBS_NS = "jobs"
+
+def make_redis(url: str) -> Redis:
+    # short timeouts: a slow or down Redis should degrade to a cache miss
+    return Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+
+def digest(*parts: Optional[str]) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update((p or "").encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+async def ns_key(r: Optional[Redis], ns: str, *parts: object) -> Optional[str]:
+    """
+    Build a key inside a namespace. bump_ns() moves the namespace to a new
+    generation, so every key built before it stops matching and ages out via TTL.
+    Returns None when Redis is unavailable (caller skips the cache).
+    """
+    if r is None:
+        return None
+    try:
+        gen = (await r.get(f"cache:{ns}:gen") or b"0").decode()
+    except RedisError as e:
+        log.warning("cache unavailable: %s", e)
+        return None
+    return f"cache:{ns}:{gen}:" + ":".join(str(p) for p in parts)
+
+async def bump_ns(r: Optional[Redis], ns: str) -> None:
+    if r is None:
+        return
+    try:
+        await r.incr(f"cache:{ns}:gen")
+    except RedisError as e:
+        log.warning("cache bust failed for %s: %s", ns, e)
+
+async def get_bytes(r: Optional[Redis], key: Optional[str]) -> Optional[bytes]:
+    if r is None or key is None:
+        return None
+    try:
+        return await r.get(key)
+    except RedisError as e:
+        log.warning("cache get failed: %s", e)
+        return None
+
+async def set_bytes(
+    r: Optional[Redis], key: Optional[str], value: bytes, ttl: int, nx: bool = False
+) -> None:
+    if r is None or key is None:
+        return
+    try:
+        await r.set(key, value, ex=ttl, nx=nx)
+    except RedisError as e:
+        log.warning("cache set failed: %s", e)
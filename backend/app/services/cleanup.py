@@ -1,8 +1,32 @@
 from __future__ import annotations
+import os
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.db import SessionLocal
-from app.models import Job
+
+_BATCH = int(os.getenv("CLEANUP_BATCH_SIZE", "10000"))
+
+# Range scan on ix_jobs_posted_at_desc; bounded batches keep each lock/transaction
+# short instead of one DELETE holding the whole expired range (plus cascades).
+_DELETE_BATCH = text(
+    "DELETE FROM jobs WHERE ctid IN "
+    "(SELECT ctid FROM jobs WHERE posted_at < :cutoff LIMIT :n)"
+)
+
+def delete_before(cutoff: datetime) -> int:
+    """Delete jobs with posted_at < cutoff, committing every batch. Returns rows deleted."""
+    total = 0
+    db: Session = SessionLocal()
+    try:
+        while True:
+            n = db.execute(_DELETE_BATCH, {"cutoff": cutoff, "n": _BATCH}).rowcount or 0
+            db.commit()
+            total += n
+            if n < _BATCH:
+                return total
+    finally:
+        db.close()
 
 def cleanup_old_jobs(ttl_hours: int = 48) -> int:
     """
@@ -10,14 +34,4 @@ def cleanup_old_jobs(ttl_hours: int = 48) -> int:
     Returns number of rows deleted.
     """
     cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
-    db: Session = SessionLocal()
-    try:
-        deleted = (
-            db.query(Job)
-              .filter(Job.posted_at < cutoff)
-              .delete(synchronize_session=False)
-        )
-        db.commit()
-        return int(deleted or 0)
-    finally:
-        db.close()
+    return delete_before(cutoff)
@@ -1,8 +1,85 @@
-from simhash import Simhash
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+# Simhash's own tokenizer: lowercase, keep word chars, then 4-char shingles
+_TOKEN_RE = re.compile(r"[\w\u4e00-\u9fcc]+")
+_UNIT_SHIFTS = np.array([48, 32, 16, 0], dtype=np.uint64)
+
+_Shingles = Union[Tuple[np.ndarray, np.ndarray], Counter]
+
+def _features(s: str) -> Counter:
+    # same weighted features Simhash(text) builds, but counted in C instead of sort+groupby
+    return Counter(s[i:i + 4] for i in range(max(len(s) - 3, 1)))
+
+def _shingles(text: str) -> _Shingles:
+    """
+    Distinct 4-char shingles of `text` with their counts. When the text stays in
+    the BMP (nearly always), each shingle packs into one uint64 of four UTF-16
+    units, so the sliding window and the counting are array ops, not a Python
+    loop per character. Otherwise, fall back to a Counter of str shingles.
+    """
+    s = "".join(_TOKEN_RE.findall(text.lower()))
+    units = s.encode("utf-16-le")
+    if len(units) != 2 * len(s):
+        return _features(s)
+    # \0 is never a word char: right-padding keeps a short text's single
+    # shingle (Simhash takes s[0:4] as is) unambiguous
+    cu = np.frombuffer(units.ljust(8, b"\0"), dtype="<u2").astype(np.uint64)
+    keys = (cu[:-3] << 48) | (cu[1:-2] << 32) | (cu[2:-1] << 16) | cu[3:]
+    return np.unique(keys, return_counts=True)
+
+def _unpack(keys: np.ndarray) -> List[str]:
+    units = ((keys[:, None] >> _UNIT_SHIFTS) & 0xFFFF).astype("<u2")
+    flat = units.tobytes().decode("utf-16-le")
+    return [flat[i:i + 4].rstrip("\0") for i in range(0, len(flat), 4)]
+
+def simhash_batch(texts: List[str]) -> List[str]:
+    """
+    Fingerprint many texts at once. Postings from one board share most of their
+    boilerplate, so each distinct shingle is hashed and unpacked to bits once for
+    the whole batch; a text's fingerprint is then one weighted bit-sum over rows
+    of that matrix. Values are identical to Simhash(text) — stored hash_sim
+    values stay comparable.
+    """
+    docs = [_shingles(t) for t in texts]
+    packed = [d[0] for d in docs if not isinstance(d, Counter)]
+    if packed:
+        uniq, inv = np.unique(np.concatenate(packed), return_inverse=True)
+        shingles = _unpack(uniq)
+    else:
+        inv, shingles = np.empty(0, dtype=np.intp), []
+
+    # (row indices, weights) per text; non-BMP texts index past the packed rows
+    extra: Dict[str, int] = {}
+    per_doc: List[Tuple[np.ndarray, np.ndarray]] = []
+    pos = 0
+    for d in docs:
+        if isinstance(d, Counter):
+            base = len(shingles)
+            idx = np.fromiter((extra.setdefault(sh, base + len(extra)) for sh in d),
+                              dtype=np.intp, count=len(d))
+            per_doc.append((idx, np.fromiter(d.values(), dtype=np.int64, count=len(d))))
+        else:
+            n = len(d[0])
+            per_doc.append((inv[pos:pos + n], d[1]))
+            pos += n
+    shingles.extend(extra)
+
+    # Simhash keeps the low 8 bytes of each md5 digest, big-endian bit order
+    digests = b"".join(hashlib.md5(sh.encode("utf-8")).digest()[-8:] for sh in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, 64)
+    return [
+        hex(int.from_bytes(np.packbits(w @ bits[idx] > w.sum() / 2).tobytes(), "big"))
+        for idx, w in per_doc
+    ]
 
 def simhash_text(text: str) -> str:
-    return hex(Simhash(text).value)
+    return simhash_batch([text])[0]
 
 def is_dup(hash_a: str, hash_b: str, hamming_thresh: int = 4) -> bool:
-    a, b = int(hash_a, 16), int(hash_b, 16)
-    return bin(a ^ b).count("1") <= hamming_thresh
\ No newline at end of file
+    # popcount directly on the int; no intermediate binary string
+    return (int(hash_a, 16) ^ int(hash_b, 16)).bit_count() <= hamming_thresh
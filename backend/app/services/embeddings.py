@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from app.config import settings
 
 def embeddings_enabled() -> bool:
@@ -13,16 +15,27 @@ def upsert_job_embeddings(db, job_id: str, title: str, description: str) -> None
     # If/when you enable pgvector, put the insertion code here.
     return
 
+def upsert_job_embeddings_batch(db, jobs: List[Tuple[str, str, str]]) -> None:
+    """
+    (job_id, title, description) for freshly committed jobs; called once per
+    ingest batch so the embedding model sees one batched request, not N.
+    """
+    if not embeddings_enabled() or not jobs:
+        return
+    # If/when you enable pgvector, embed all titles/descriptions in one call here.
+    return
+
 def similarity_search(db, query: str, limit: int = 20):
     if not embeddings_enabled():
-        # Fallback: very simple text search when vectors are off
-        from sqlalchemy import or_
+        # Fallback: full-text search when vectors are off. search_vec covers
+        # title/company/description and is GIN-indexed (same as /jobs/search).
+        from sqlalchemy import func
         from app.models import Job
-        q = f"%{query.lower()}%"
+        tsq = func.plainto_tsquery("english", query)
         return (
             db.query(Job)
-              .filter(or_(Job.title.ilike(q), Job.company.ilike(q), Job.description_md.ilike(q)))
-              .order_by(Job.posted_at.desc())
+              .filter(Job.search_vec.op("@@")(tsq))
+              .order_by(func.ts_rank_cd(Job.search_vec, tsq).desc(), Job.posted_at.desc())
               .limit(limit)
               .all()
         )
@@ -1,21 +1,82 @@
 # app/services/harvest.py
 from __future__ import annotations
 
+import hashlib
 import os
-import json
+import re
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 from datetime import datetime, timezone
 
 import httpx
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from selectolax.lexbor import LexborHTMLParser
 from sqlalchemy.orm import Session
 
-from app.services.jobs import upsert_jobs
-from app.services.dedupe import simhash_text  # keep if you use it for de-dupe
+from app.scrapers.base import HarvestResult
+from app.services.jobs import fingerprint_items, upsert_jobs
 
 log = logging.getLogger(__name__)
 
-HTTP_TIMEOUT = float(os.getenv("HARVEST_HTTP_TIMEOUT", "20"))  # seconds
+
+def _env_csv(name: str, default: str = "") -> Tuple[str, ...]:
+    return tuple(v.strip() for v in os.getenv(name, default).split(",") if v.strip())
+
+
+@dataclass(frozen=True, slots=True)
+class HarvestConfig:
+    """Harvest env settings, parsed once at import instead of on every sweep."""
+    sources: Tuple[str, ...]
+    ashby_orgs: Tuple[str, ...]
+    greenhouse_orgs: Tuple[str, ...]
+    http_timeout: float    # seconds
+    fetch_workers: int     # board GETs in flight at once
+    ingest_batch: int      # items per upsert_jobs call (one transaction)
+    parse_workers: int     # processes for board JSON/HTML parsing; 0 = inline
+
+    @classmethod
+    def from_env(cls) -> "HarvestConfig":
+        return cls(
+            sources=tuple(s.lower() for s in _env_csv("HARVEST_SOURCES", "ashby,greenhouse")),
+            ashby_orgs=_env_csv("ASHBY_ORGS"),
+            greenhouse_orgs=_env_csv("GREENHOUSE_ORGS"),
+            http_timeout=float(os.getenv("HARVEST_HTTP_TIMEOUT", "20")),
+            fetch_workers=int(os.getenv("HARVEST_FETCH_CONCURRENCY", "8")),
+            ingest_batch=int(os.getenv("HARVEST_INGEST_BATCH", "1000")),
+            parse_workers=int(os.getenv("HARVEST_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+        )
+
+    @classmethod
+    def reload_from_env(cls) -> "HarvestConfig":
+        # tests / ops: pick up env changes made after import
+        global CONFIG
+        CONFIG = cls.from_env()
+        return CONFIG
+
+
+CONFIG = HarvestConfig.from_env()
+
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30)
+
+_RE_LINE_WS = re.compile(r"[^\S\n]*\n[^\S\n]*")  # whitespace hugging a newline
+_RE_BLANK_RUN = re.compile(r"\n{3,}")
+# most postings are unchanged between sweeps: remember converted descriptions.
+# Keyed by a blake2b digest of the source so entries hold the output, not the
+# HTML; a collision would hand one posting another's text (and hash_sim), so
+# not Python's hash(). Per process (each parse worker keeps its own)
+_MD_CACHE_MAX = int(os.getenv("HARVEST_MD_CACHE_MAX", "5000"))
+_md_cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+_md_lock = threading.Lock()  # inline parsing can run in concurrent run_harvest threads
+
+_REMOTE_RE = re.compile(r"remote|work from home|hybrid|on-?site", re.I)
 
 
 # ---------- Public API (sync) ----------
@@ -35,25 +96,53 @@ def harvest_once(
       ASHBY_ORGS=roblox,togetherai
       GREENHOUSE_ORGS=databricks,snowflake
 
-    Returns { source: {seen, inserted, skipped_dupe, errors}, ... , total: {...} }
+    Returns { source: {seen, inserted, updated, skipped_dupe, errors, conflicts}, ...,
+              total: {...} }
     """
-    sources = _resolve_sources(sources)
-    ashby_orgs = _resolve_list(ashby_orgs, os.getenv("ASHBY_ORGS", ""))
-    greenhouse_orgs = _resolve_list(greenhouse_orgs, os.getenv("GREENHOUSE_ORGS", ""))
+    # sync entry (scheduler worker process, run_harvest's worker thread):
+    # drive the async sweep on a private event loop
+    return asyncio.run(harvest_async(
+        db, sources, ashby_orgs=ashby_orgs, greenhouse_orgs=greenhouse_orgs,
+    ))
 
-    overall: Dict[str, Any] = {}
-    total = {"seen": 0, "inserted": 0, "skipped_dupe": 0, "errors": 0}
 
-    with httpx.Client(timeout=HTTP_TIMEOUT, follow_redirects=True) as client:
-        if "ashby" in sources and ashby_orgs:
-            stats = _harvest_ashby(db, client, ashby_orgs)
-            overall["ashby"] = stats
-            _rollup(total, stats)
+async def harvest_async(
+    db: Session,
+    sources: Optional[List[str]] = None,
+    *,
+    ashby_orgs: Optional[List[str]] = None,
+    greenhouse_orgs: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Async body of harvest_once; same params and result."""
+    cfg = CONFIG  # one snapshot for the whole sweep
+    sources = _resolve_sources(sources, cfg)
+    ashby_orgs = _resolve_list(ashby_orgs, cfg.ashby_orgs)
+    greenhouse_orgs = _resolve_list(greenhouse_orgs, cfg.greenhouse_orgs)
+
+    boards: List[Tuple[str, str]] = []
+    if "ashby" in sources:
+        boards += [("ashby", o) for o in ashby_orgs]
+    if "greenhouse" in sources:
+        boards += [("greenhouse", o) for o in greenhouse_orgs]
+
+    # each source is a single API host: HTTP/2 multiplexes all of its boards
+    # over one warm TLS connection instead of a handshake per org
+    # Accept-Encoding is left to httpx: it advertises br/zstd exactly when the
+    # brotli/zstandard extras are installed, and content=true boards shrink well
+    async with httpx.AsyncClient(
+        timeout=cfg.http_timeout,
+        follow_redirects=True,
+        http2=True,
+        limits=_HTTP_LIMITS,
+    ) as client:
+        per_source = await _fan_out(db, client, boards, cfg)
 
-        if "greenhouse" in sources and greenhouse_orgs:
-            stats = _harvest_greenhouse(db, client, greenhouse_orgs)
-            overall["greenhouse"] = stats
-            _rollup(total, stats)
+    overall: Dict[str, Any] = {}
+    total = _new_stats()
+    for name in _FETCHERS:
+        if name in per_source:
+            overall[name] = per_source[name]
+            _rollup(total, per_source[name])
 
     overall["total"] = total
     return overall
@@ -71,9 +160,9 @@ async def run_harvest(
     """
     Async facade used by app/routers/harvest.py.
 
-    - Opens a DB session.
     - Splits orgs by source using `extra` or env vars.
-    - Calls `harvest_once` and returns the result.
+    - Calls `harvest_once` in a worker thread with its own DB session and event
+      loop, so board parsing and commits never stall the API's loop.
     """
     # Lazy import to avoid circulars during startup
     try:
@@ -82,12 +171,12 @@ async def run_harvest(
         log.exception("Failed to import SessionLocal from app.db: %s", e)
         raise
 
-    sources = _resolve_sources(sources)
+    sources = _resolve_sources(sources, CONFIG)
 
     # Prefer explicit per-source lists from `extra`
     extra = extra or {}
-    ashby_orgs: Optional[List[str]] = _resolve_list(extra.get("ashby_orgs"), os.getenv("ASHBY_ORGS", ""))
-    greenhouse_orgs: Optional[List[str]] = _resolve_list(extra.get("greenhouse_orgs"), os.getenv("GREENHOUSE_ORGS", ""))
+    ashby_orgs: Optional[List[str]] = _resolve_list(extra.get("ashby_orgs"), CONFIG.ashby_orgs)
+    greenhouse_orgs: Optional[List[str]] = _resolve_list(extra.get("greenhouse_orgs"), CONFIG.greenhouse_orgs)
 
     # If caller passed a flat `orgs` list, use it for any requested sources that
     # don't already have per-source lists configured.
@@ -98,162 +187,367 @@ async def run_harvest(
         if "greenhouse" in sources and not greenhouse_orgs:
             greenhouse_orgs = orgs
 
-    # Open session and run
-    with SessionLocal() as db:
-        return harvest_once(
-            db,
-            sources=sources,
-            ashby_orgs=ashby_orgs,
-            greenhouse_orgs=greenhouse_orgs,
-        )
+    def _run() -> Dict[str, Any]:
+        # sync Session is thread-bound: open it inside the worker thread
+        with SessionLocal() as db:
+            return harvest_once(
+                db,
+                sources=sources,
+                ashby_orgs=ashby_orgs,
+                greenhouse_orgs=greenhouse_orgs,
+            )
+
+    return await run_in_threadpool(_run)
 
 
 # ---------- Scrapers ----------
 
-def _harvest_ashby(db: Session, client: httpx.Client, orgs: List[str]) -> Dict[str, int]:
-    stats = {"seen": 0, "inserted": 0, "skipped_dupe": 0, "errors": 0}
-    for org in orgs:
-        org_slug = org.strip()
-        if not org_slug:
-            continue
-        url = f"https://api.ashbyhq.com/posting-api/job-board/{org_slug}"
-        try:
-            resp = client.get(url)
-            if resp.status_code != 200:
-                log.warning("Ashby non-200 for %s: %s", org_slug, resp.status_code)
-                stats["errors"] += 1
-                continue
+async def _fan_out(
+    db: Session, client: httpx.AsyncClient, boards: List[Tuple[str, str]], cfg: HarvestConfig
+) -> Dict[str, Dict[str, int]]:
+    """
+    Producer/consumer over every (source, org) board of the sweep: all board
+    GETs overlap on the AsyncClient (at most HARVEST_FETCH_CONCURRENCY in
+    flight). Landed boards pile up per source and go to upsert_jobs in batches
+    of HARVEST_INGEST_BATCH items, so a sweep over many small boards costs a
+    few transactions instead of one per org. upsert_jobs is sync SQLAlchemy,
+    so it runs in a thread while the other fetches progress; batches are
+    ingested one at a time, so the single Session is never shared.
+    Returns per-source stats.
+    """
+    stats: Dict[str, Dict[str, int]] = {}
+    seen_hashes: Set[str] = set()  # dedupe across every board/source in this sweep
+    boards = [(src, o.strip()) for src, o in boards if o and o.strip()]
+    for src, _ in boards:
+        stats.setdefault(src, _new_stats())
+    if not boards:
+        return stats
+    sem = asyncio.Semaphore(cfg.fetch_workers)
+    pending: Dict[str, List[HarvestResult]] = {src: [] for src in stats}
+    pending_boards: Dict[str, List[_Board]] = {src: [] for src in stats}
+
+    async def fetch(src: str, slug: str) -> Tuple[str, str, Any]:
+        async with sem:
+            try:
+                return src, slug, await _FETCHERS[src][0](client, slug)
+            except Exception as e:
+                return src, slug, e
+
+    async def ingest(src: str) -> None:
+        items, pending[src] = pending[src], []
+        landed, pending_boards[src] = pending_boards[src], []
+        # landed[k]'s postings are items[spans[k][0]:spans[k][1]] (boards are
+        # appended whole); a board's validators are only kept if all of them landed
+        spans, end = [], 0
+        for board in landed:
+            spans.append((end, end + len(board.items)))
+            end += len(board.items)
+        failed: Set[int] = set()
+        # one big board can overshoot ingest_batch many times over: upsert it in
+        # batch-sized chunks so only one chunk's row dicts are alive at a time
+        for i in range(0, len(items), cfg.ingest_batch):
+            chunk = items[i:i + cfg.ingest_batch]
             try:
-                data = resp.json()
-            except json.JSONDecodeError:
-                log.warning("GET JSON failed %s: Expecting value at 1:1", url)
-                stats["errors"] += 1
-                continue
-
-            postings = data.get("jobs") or data.get("postings") or []
-            if not isinstance(postings, list):
-                log.warning("Ashby unexpected jobs payload for %s", org_slug)
-                stats["errors"] += 1
-                continue
-
-            items: List[Dict[str, Any]] = []
-            for j in postings:
-                if not isinstance(j, dict):
-                    continue
-                title = _s(j.get("title"))
-                company = _s(j.get("companyName") or org_slug)
-                apply_url = _s(j.get("applyUrl") or j.get("url"))
-                canonical_url = _s(j.get("jobUrl") or j.get("jobUrlForJobBoard") or apply_url)
-                location = _s(_ashby_location(j))
-                level = _s(j.get("seniority") or j.get("jobLevel"))
-                employment_type = _s(j.get("employmentType"))
-                posted_at = _dt(_s(j.get("publishedAt") or j.get("createdAt")))
-                desc_html = j.get("descriptionHtml") or j.get("description") or ""
-                description_md = _to_markdown(desc_html)
-
-                if not (title and company and description_md and apply_url):
-                    continue
-
-                items.append({
-                    "source": "ashby",
-                    "company": company,
-                    "title": title,
-                    "location": location,
-                    "remote": _remote_from_text(description_md),
-                    "employment_type": employment_type,
-                    "level": level,
-                    "posted_at": posted_at,
-                    "apply_url": apply_url,
-                    "canonical_url": canonical_url,
-                    "currency": None,
-                    "salary_min": None,
-                    "salary_max": None,
-                    "salary_period": None,
-                    "description_md": description_md,
-                    "description_raw": None,
-                    "meta": {"org": org_slug, "raw_id": j.get("id")},
-                })
-
-            res = upsert_jobs(db, items)
-            _rollup(stats, res)
-
-        except Exception as e:
-            log.exception("Ashby fetch failed for %s: %s", org_slug, e)
-            stats["errors"] += 1
+                # slotted records until here; upsert_jobs takes plain dicts
+                rows = [it.as_dict() for it in chunk]
+                res = await asyncio.to_thread(upsert_jobs, db, rows, seen_hashes)
+                _rollup(stats[src], res)
+                # a failed flush is counted in errors, not raised
+                ok = not res["errors"]
+            except Exception:
+                log.exception(
+                    "%s ingest failed for %d items", _FETCHERS[src][1], len(chunk),
+                    extra={"source": src},
+                )
+                stats[src]["errors"] += 1
+                ok = False
+            if not ok:
+                j = i + len(chunk)
+                failed.update(k for k, (lo, hi) in enumerate(spans) if lo < j and hi > i)
+        # anything not remembered is refetched in full next sweep, so its
+        # missing rows get another try instead of hiding behind a 304
+        for k, board in enumerate(landed):
+            if k not in failed:
+                _remember(board)
+
+    for done in asyncio.as_completed([fetch(src, slug) for src, slug in boards]):
+        src, org_slug, board = await done
+        if isinstance(board, Exception):
+            # traceback comes from exc_info; source/org ride along as fields
+            log.error(
+                "%s fetch failed for %s", _FETCHERS[src][1], org_slug,
+                exc_info=board, extra={"source": src, "org": org_slug},
+            )
+            stats[src]["errors"] += 1
+            continue
+        if board is None:
+            stats[src]["errors"] += 1
+            continue
+        if board.items is None:
+            # 304: every posting is already stored; report them as such
+            n = _known_count(board.url)
+            stats[src]["seen"] += n
+            stats[src]["skipped_dupe"] += n
+            continue
+        pending[src].extend(board.items)
+        pending_boards[src].append(board)
+        if len(pending[src]) >= cfg.ingest_batch:
+            await ingest(src)
 
+    for src in pending:
+        await ingest(src)
     return stats
 
 
-def _harvest_greenhouse(db: Session, client: httpx.Client, orgs: List[str]) -> Dict[str, int]:
+async def _fetch_ashby(client: httpx.AsyncClient, org_slug: str) -> Optional[_Board]:
+    url = f"https://api.ashbyhq.com/posting-api/job-board/{org_slug}"
+    return await _fetch_board(client, "ashby", org_slug, url, _ashby_items)
+
+
+def _ashby_items(org_slug: str, url: str, body: bytes) -> Optional[List[HarvestResult]]:
+    try:
+        data = orjson.loads(body)  # bytes straight in: no str decode
+    except orjson.JSONDecodeError:
+        log.warning("GET JSON failed %s: Expecting value at 1:1", url,
+                    extra={"source": "ashby", "org": org_slug})
+        return None
+
+    postings = data.get("jobs") or data.get("postings") or []
+    if not isinstance(postings, list):
+        log.warning("Ashby unexpected jobs payload for %s", org_slug,
+                    extra={"source": "ashby", "org": org_slug})
+        return None
+
+    items: List[HarvestResult] = []
+    for j in postings:
+        if not isinstance(j, dict):
+            continue
+        title = _s(j.get("title"))
+        company = _s(j.get("companyName") or org_slug)
+        apply_url = _s(j.get("applyUrl") or j.get("url"))
+        # cheap required fields first: rejects skip the HTML conversion and parsing below
+        if not (title and company and apply_url):
+            continue
+        description_md = _to_markdown(j.get("descriptionHtml") or j.get("description") or "")
+        if not description_md:
+            continue
+
+        canonical_url = _s(j.get("jobUrl") or j.get("jobUrlForJobBoard") or apply_url)
+        location = _s(_ashby_location(j))
+        level = _s(j.get("seniority") or j.get("jobLevel"))
+        employment_type = _s(j.get("employmentType"))
+        posted_at = _dt(_s(j.get("publishedAt") or j.get("createdAt")))
+
+        items.append(HarvestResult(
+            source="ashby",
+            company=company,
+            title=title,
+            location=location,
+            remote=_remote_of(location, description_md),
+            employment_type=employment_type,
+            level=level,
+            posted_at=posted_at,
+            apply_url=apply_url,
+            canonical_url=canonical_url,
+            description_md=description_md,
+            meta={"org": org_slug, "raw_id": j.get("id")},
+        ))
+
+    return items
+
+
+async def _fetch_greenhouse(client: httpx.AsyncClient, org_slug: str) -> Optional[_Board]:
     """
     Greenhouse public board API:
       https://boards-api.greenhouse.io/v1/boards/{org}/jobs?content=true
     Observation: `jobs[].content` is typically an HTML string; handle strings, lists, or dicts.
     """
-    stats = {"seen": 0, "inserted": 0, "skipped_dupe": 0, "errors": 0}
-    for org in orgs:
-        org_slug = org.strip()
-        if not org_slug:
+    url = f"https://boards-api.greenhouse.io/v1/boards/{org_slug}/jobs?content=true"
+    return await _fetch_board(client, "greenhouse", org_slug, url, _greenhouse_items)
+
+
+def _greenhouse_items(org_slug: str, url: str, body: bytes) -> Optional[List[HarvestResult]]:
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        log.warning("GET JSON failed %s: Expecting value at 1:1", url,
+                    extra={"source": "greenhouse", "org": org_slug})
+        return None
+    postings = data.get("jobs", [])
+    if not isinstance(postings, list):
+        log.warning("Greenhouse unexpected jobs payload for %s", org_slug,
+                    extra={"source": "greenhouse", "org": org_slug})
+        return None
+
+    items: List[HarvestResult] = []
+    for j in postings:
+        if not isinstance(j, dict):
+            continue
+        title = _s(j.get("title"))
+        company = _s(j.get("company_name") or org_slug)
+        apply_url = _s(j.get("absolute_url") or j.get("url"))
+        # cheap required fields first: rejects skip the HTML conversion and parsing below
+        if not (title and company and apply_url):
+            continue
+        description_md = _extract_greenhouse_description(j)
+        if not description_md:
             continue
-        url = f"https://boards-api.greenhouse.io/v1/boards/{org_slug}/jobs?content=true"
-        try:
-            resp = client.get(url)
+
+        canonical_url = _s(j.get("absolute_url") or apply_url)
+        posted_at = _dt(j.get("updated_at") or j.get("created_at"))
+        location = _s((j.get("location") or {}).get("name")) if isinstance(j.get("location"), dict) else _s(j.get("location"))
+
+        items.append(HarvestResult(
+            source="greenhouse",
+            company=company,
+            title=title,
+            location=location,
+            remote=_remote_of(location, description_md),
+            posted_at=posted_at,
+            apply_url=apply_url,
+            canonical_url=canonical_url,
+            description_md=description_md,
+            meta={"org": org_slug, "raw_id": j.get("id")},
+        ))
+
+    return items
+
+
+class _Board(NamedTuple):
+    url: str
+    items: Optional[List[HarvestResult]]  # None: unchanged since its last ingest (304)
+    validators: Dict[str, str]             # conditional-GET headers for the next sweep
+
+
+async def _fetch_board(
+    client: httpx.AsyncClient, src: str, org_slug: str, url: str,
+    parse: Callable[[str, str, bytes], Optional[List[HarvestResult]]],
+) -> Optional[_Board]:
+    resp = await _get_board(client, src, org_slug, url)
+    if resp is None:
+        return None
+    if resp.status_code == 304:
+        return _Board(url, None, {})
+    items = await _parse_board(parse, org_slug, url, resp.content)
+    return None if items is None else _Board(url, items, _validators_of(resp))
+
+
+async def _get_board(
+    client: httpx.AsyncClient, src: str, org_slug: str, url: str
+) -> Optional[httpx.Response]:
+    """
+    Response triage for every board: the read response on 200 (or 304 against
+    our cached validators); None (logged, counted as an error by _fan_out) for
+    anything else or a transport failure. Only unexpected exceptions escape,
+    and those get a traceback upstream.
+    """
+    label = _FETCHERS[src][1]
+    with _validated_lock:
+        cached = _validated.get(url)
+    try:
+        async with client.stream("GET", url, headers=cached[0] if cached else None) as resp:
+            if resp.status_code == 304 and cached:
+                return resp  # unchanged board: no body on the wire at all
             if resp.status_code != 200:
-                log.warning("Greenhouse non-200 for %s: %s", org_slug, resp.status_code)
-                stats["errors"] += 1
-                continue
-
-            data = resp.json()
-            postings = data.get("jobs", [])
-            if not isinstance(postings, list):
-                log.warning("Greenhouse unexpected jobs payload for %s", org_slug)
-                stats["errors"] += 1
-                continue
-
-            items: List[Dict[str, Any]] = []
-            for j in postings:
-                if not isinstance(j, dict):
-                    continue
-                title = _s(j.get("title"))
-                company = _s(j.get("company_name") or org_slug)
-                apply_url = _s(j.get("absolute_url") or j.get("url"))
-                canonical_url = _s(j.get("absolute_url") or apply_url)
-                posted_at = _dt(j.get("updated_at") or j.get("created_at"))
-                location = _s((j.get("location") or {}).get("name")) if isinstance(j.get("location"), dict) else _s(j.get("location"))
-
-                description_md = _extract_greenhouse_description(j)
-
-                if not (title and company and description_md and apply_url):
-                    continue
-
-                items.append({
-                    "source": "greenhouse",
-                    "company": company,
-                    "title": title,
-                    "location": location,
-                    "remote": _remote_from_text(description_md),
-                    "employment_type": None,
-                    "level": None,
-                    "posted_at": posted_at,
-                    "apply_url": apply_url,
-                    "canonical_url": canonical_url,
-                    "currency": None,
-                    "salary_min": None,
-                    "salary_max": None,
-                    "salary_period": None,
-                    "description_md": description_md,
-                    "description_raw": None,
-                    "meta": {"org": org_slug, "raw_id": j.get("id")},
-                })
-
-            res = upsert_jobs(db, items)
-            _rollup(stats, res)
-
-        except Exception as e:
-            log.exception("Greenhouse fetch failed for %s: %s", org_slug, e)
-            stats["errors"] += 1
+                log.warning("%s non-200 for %s: %s", label, org_slug, resp.status_code,
+                            extra={"source": src, "org": org_slug, "status": resp.status_code})
+                return None  # error page body is never downloaded
+            # read inside the block: the connection is back in the pool before the parse
+            await resp.aread()
+            return resp
+    except httpx.HTTPError as e:
+        # timeouts/resets are routine at sweep scale: one line, no traceback
+        log.warning("%s GET failed for %s: %r", label, org_slug, e,
+                    extra={"source": src, "org": org_slug})
+        return None
 
-    return stats
+
+# Boards are re-polled every sweep and mostly unchanged: keep each board's
+# ETag/Last-Modified (and item count) so the next sweep can send a conditional
+# GET. Recorded only once a board's items are ingested, so a failed ingest is
+# retried with a full fetch. Same bounded-LRU shape as scrapers/http.py.
+_VALIDATED_MAX = int(os.getenv("HARVEST_ETAG_CACHE_MAX", "4096"))
+_validated: "OrderedDict[str, Tuple[Dict[str, str], int]]" = OrderedDict()
+_validated_lock = threading.Lock()  # concurrent run_harvest sweeps share it
+
+def _validators_of(resp: httpx.Response) -> Dict[str, str]:
+    cond: Dict[str, str] = {}
+    if etag := resp.headers.get("etag"):
+        cond["If-None-Match"] = etag
+    if last_modified := resp.headers.get("last-modified"):
+        cond["If-Modified-Since"] = last_modified
+    return cond
+
+def _remember(board: _Board) -> None:
+    if not board.validators or board.items is None:
+        return
+    with _validated_lock:
+        _validated[board.url] = (board.validators, len(board.items))
+        _validated.move_to_end(board.url)
+        while len(_validated) > _VALIDATED_MAX:
+            _validated.popitem(last=False)
+
+def _known_count(url: str) -> int:
+    with _validated_lock:
+        cached = _validated.get(url)
+        if cached is None:
+            return 0
+        _validated.move_to_end(url)
+        return cached[1]
+
+
+async def _parse_board(
+    fn: Callable[[str, str, bytes], Optional[List[HarvestResult]]],
+    org_slug: str, url: str, body: bytes,
+) -> Optional[List[HarvestResult]]:
+    """
+    Turn a board's raw JSON body into ingest items. JSON decode + per-posting
+    HTML conversion is the CPU-heavy part of a sweep, so it runs in a process
+    pool: boards parse on several cores, outside the GIL, while the loop keeps
+    fetching. Only the slug/url/bytes go in and slotted HarvestResults come back.
+    """
+    pool = _parse_pool()
+    if pool is None:
+        return _parse_items(fn, org_slug, url, body)
+    return await asyncio.get_running_loop().run_in_executor(
+        pool, _parse_items, fn, org_slug, url, body
+    )
+
+
+def _parse_items(
+    fn: Callable[[str, str, bytes], Optional[List[HarvestResult]]],
+    org_slug: str, url: str, body: bytes,
+) -> Optional[List[HarvestResult]]:
+    items = fn(org_slug, url, body)
+    if items:
+        # simhash is the other CPU-heavy step: do it here on the pool's cores
+        # rather than in upsert_jobs' thread, which shares the loop's GIL
+        for it, h in zip(items, fingerprint_items([it.as_dict() for it in items])):
+            it.hash_sim = h
+    return items
+
+
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+def _parse_pool() -> Optional[ProcessPoolExecutor]:
+    # lazy and process-wide; HARVEST_PARSE_WORKERS=0 parses inline on the loop
+    global _PARSE_POOL
+    if _PARSE_POOL is None and CONFIG.parse_workers > 0:
+        _PARSE_POOL = ProcessPoolExecutor(
+            max_workers=CONFIG.parse_workers,
+            # fresh interpreters: no inherited engine, sockets or loop threads
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PARSE_POOL
+
+
+_Fetch = Callable[[httpx.AsyncClient, str], Awaitable[Optional[_Board]]]
+
+# source -> (board fetcher, log label); returns the fetched board, or None on failure
+_FETCHERS: Dict[str, Tuple[_Fetch, str]] = {
+    "ashby": (_fetch_ashby, "Ashby"),
+    "greenhouse": (_fetch_greenhouse, "Greenhouse"),
+}
 
 
 # ---------- helpers ----------
@@ -302,55 +596,97 @@ def _extract_greenhouse_description(j: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _resolve_sources(sources: Optional[List[str]]) -> List[str]:
+def _resolve_sources(sources: Optional[List[str]], cfg: HarvestConfig) -> List[str]:
     if sources:
         return [s.strip().lower() for s in sources if s and s.strip()]
-    env = os.getenv("HARVEST_SOURCES", "ashby,greenhouse")
-    return [s.strip().lower() for s in env.split(",") if s.strip()]
+    return list(cfg.sources)
 
-def _resolve_list(value: Optional[List[str]] | Optional[Any], env_str: str) -> List[str]:
+def _resolve_list(value: Optional[List[str]] | Optional[Any], default: Tuple[str, ...]) -> List[str]:
     # value can be List[str] or any (e.g., string) from extra; normalize
     if value:
         if isinstance(value, list):
-            return [str(v).strip() for v in value if v and str(v).strip()]
+            # strip each entry once; str() only for the odd non-str
+            stripped = ((v if isinstance(v, str) else str(v)).strip() for v in value if v)
+            return [v for v in stripped if v]
         if isinstance(value, str):
             return [v.strip() for v in value.split(",") if v.strip()]
-    if not env_str:
-        return []
-    return [v.strip() for v in env_str.split(",") if v.strip()]
+    return list(default)
+
+# upsert_jobs' counters; conflicts = postings merged by fingerprint into a row
+# of another company/title (also counted in updated or skipped_dupe)
+_STAT_KEYS = ("seen", "inserted", "updated", "skipped_dupe", "errors", "conflicts")
+
+def _new_stats() -> Dict[str, int]:
+    return dict.fromkeys(_STAT_KEYS, 0)
 
 def _rollup(dst: Dict[str, int], part: Dict[str, Any]) -> None:
-    dst["seen"] += int(part.get("seen", 0))
-    dst["inserted"] += int(part.get("inserted", 0))
-    dst["skipped_dupe"] += int(part.get("skipped_dupe", 0))
-    dst["errors"] += int(part.get("errors", 0))
+    for k in _STAT_KEYS:
+        dst[k] += int(part.get(k, 0))
 
 def _s(v: Any) -> Optional[str]:
     if v is None:
         return None
-    s = str(v).strip()
+    # board JSON hands us str for URLs/titles already; only coerce the odd number
+    s = (v if isinstance(v, str) else str(v)).strip()
     return s or None
 
 def _dt(v: Any) -> Optional[datetime]:
     if not v:
         return None
+    return _dt_str(v if isinstance(v, str) else str(v))
+
+# a board's postings share a handful of timestamps; datetimes are immutable
+@lru_cache(maxsize=8192)
+def _dt_str(s: str) -> Optional[datetime]:
     try:
-        dt = datetime.fromisoformat(str(v).replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(s)  # C parser; 3.11+ takes a trailing "Z" itself
         return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-    except Exception:
+    except ValueError:
         return None
 
 def _remote_from_text(text: Optional[str]) -> Optional[str]:
     if not text:
         return None
-    t = text.lower()
-    if "remote" in t or "work from home" in t:
-        return "remote"
-    if "hybrid" in t:
-        return "hybrid"
-    if "on-site" in t or "onsite" in t:
-        return "onsite"
-    return None
+    # one case-insensitive sweep, no lowercased copy; remote > hybrid > onsite
+    found = None
+    for m in _REMOTE_RE.finditer(text):
+        c = m.group()[0].lower()
+        if c in "rw":
+            return "remote"
+        if c == "h":
+            found = "hybrid"
+        elif found is None:
+            found = "onsite"
+    return found
+
+def _remote_of(location: Optional[str], description_md: str) -> Optional[str]:
+    # the structured location ("Remote - US", "Hybrid, NYC") is authoritative and
+    # a few bytes long; only scan the whole description when it says nothing
+    if location:
+        return _remote_from_location(location) or _remote_from_text(description_md)
+    return _remote_from_text(description_md)
+
+# a board's postings share a handful of short location strings; descriptions
+# are not cached here (that would pin thousands of full texts per worker)
+@lru_cache(maxsize=4096)
+def _remote_from_location(location: str) -> Optional[str]:
+    return _remote_from_text(location)
+
+def _html_to_text(html: str) -> str:
+    # one C parse instead of six full-string regex passes; also decodes
+    # entities and copes with nested markup. Block breaks go in as text nodes.
+    # No regex fallback: description_md feeds hash_sim, so every process must
+    # produce the same text for the same posting.
+    tree = LexborHTMLParser(html)
+    for n in tree.css("li"):
+        n.insert_before("- ")
+        n.insert_after("\n")
+    for n in tree.css("br"):
+        n.insert_before("\n")
+    for n in tree.css("p"):
+        n.insert_after("\n\n")
+    root = tree.body or tree.root
+    return root.text(separator="") if root is not None else ""
 
 def _to_markdown(html_or_md: Any) -> Optional[str]:
     """
@@ -359,29 +695,28 @@ def _to_markdown(html_or_md: Any) -> Optional[str]:
     """
     if not html_or_md:
         return None
-    text = str(html_or_md)
-
-    if "<" in text and ">" in text:
-        import re
-        text = re.sub(r"</li\s*>", "\n", text, flags=re.I)
-        text = re.sub(r"<li[^>]*>", "- ", text, flags=re.I)
-        text = re.sub(r"<\s*br\s*/?>", "\n", text, flags=re.I)
-        text = re.sub(r"</p\s*>", "\n\n", text, flags=re.I)
-        text = re.sub(r"<p[^>]*>", "", text, flags=re.I)
-        text = re.sub(r"<[^>]+>", "", text)
-
-    lines = [ln.strip() for ln in text.replace("\r", "\n").split("\n")]
-    out: List[str] = []
-    prev_blank = False
-    for ln in lines:
-        if not ln:
-            if not prev_blank:
-                out.append("")
-            prev_blank = True
-        else:
-            out.append(ln)
-            prev_blank = False
-    md = "\n".join(out).strip()
+    text = html_or_md if isinstance(html_or_md, str) else str(html_or_md)
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _md_lock:
+        if key in _md_cache:
+            _md_cache.move_to_end(key)
+            return _md_cache[key]
+    md = _convert_markdown(text)
+    with _md_lock:
+        _md_cache[key] = md
+        if len(_md_cache) > _MD_CACHE_MAX:
+            _md_cache.popitem(last=False)
+    return md
+
+def _convert_markdown(text: str) -> Optional[str]:
+    # only a ">" after the first "<" can close a tag; plain-text bodies skip the rules
+    lt = text.find("<")
+    if lt != -1 and text.find(">", lt + 1) != -1:
+        text = _html_to_text(text)
+
+    # strip every line and keep at most one blank line between blocks, in C
+    text = _RE_LINE_WS.sub("\n", text.replace("\r", "\n"))
+    md = _RE_BLANK_RUN.sub("\n\n", text).strip()
     return md or None
 
 def _ashby_location(j: Dict[str, Any]) -> Optional[str]:
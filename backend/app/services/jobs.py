@@ -1,22 +1,67 @@
 # backend/app/services/jobs.py
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Iterable, List, Optional, Tuple
-
-from sqlalchemy import select, or_, and_
+import logging
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+import psycopg
+from psycopg.types.json import Json
+from sqlalchemy import Text, any_, bindparam, literal_column, select, or_, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.models import Job
-from app.services.dedupe import simhash_text
+from app.services.dedupe import simhash_batch
+from app.services.embeddings import embeddings_enabled, upsert_job_embeddings_batch
 
+log = logging.getLogger(__name__)
 
 _MIN_DESC_FOR_SIMHASH = 120  # if shorter, we fallback to a metadata-based hash
-_RECENT_WINDOW_FOR_HASH_MATCH_DAYS = 90
+_INSERT_BATCH = 1000  # new rows buffered per flush
+# cold-start sweeps (empty table/window) land thousands of new rows at once;
+# from this size a flush streams them through COPY instead of a bound INSERT
+_COPY_MIN_ROWS = int(os.getenv("INGEST_COPY_MIN_ROWS", "500"))
+
+# A hash_sim conflict is the same posting seen again: merge it in the INSERT
+# itself (same rules as the URL-match path in upsert_jobs) instead of dropping it.
+_BACKFILL_TEXT = ("canonical_url", "apply_url", "currency", "salary_period",
+                  "location", "level", "employment_type", "remote")
+_MERGE_SET = {
+    "posted_at": "GREATEST(jobs.posted_at, EXCLUDED.posted_at)",
+    "description_md": (
+        "CASE WHEN length(EXCLUDED.description_md) > length(jobs.description_md) "
+        "THEN EXCLUDED.description_md ELSE jobs.description_md END"
+    ),
+    **{c: f"COALESCE(NULLIF(jobs.{c}, ''), NULLIF(EXCLUDED.{c}, ''), jobs.{c})"
+       for c in _BACKFILL_TEXT},
+    "salary_min": "COALESCE(jobs.salary_min, EXCLUDED.salary_min)",
+    "salary_max": "COALESCE(jobs.salary_max, EXCLUDED.salary_max)",
+}
+# plain repeats (the common case) match no row: no dead tuple, no WAL
+_MERGE_WHERE = "({}) IS DISTINCT FROM ({})".format(
+    ", ".join(f"jobs.{c}" for c in _MERGE_SET), ", ".join(_MERGE_SET.values())
+)
+# xmax is 0 only on a freshly inserted tuple: tells inserts from merges in one pass
+_MERGE_RETURNING = "id, hash_sim, (xmax = 0) AS inserted"
 
 
 def _first(s: Optional[str]) -> str:
-    return (s or "").strip()
+    # location/level/salary fields are usually missing: no "".strip() for those
+    return s.strip() if s else ""
+
+
+def _interned(s: str) -> str:
+    # company/title/source repeat across a board's postings (JSON decoding makes
+    # a fresh copy of each): keep one shared object per distinct short value
+    return sys.intern(s) if len(s) < 64 else s
 
 
 def _canon_url(u: Optional[str]) -> Optional[str]:
@@ -39,47 +84,53 @@ def _num_or_none(x: Any) -> Optional[float]:
 def _parse_ts(x: Any) -> datetime:
     # Expecting ISO8601 or datetime; default to now() if missing
     if isinstance(x, datetime):
-        dt = x
-    else:
-        try:
-            # Allow timezone-naive; treat as UTC
-            dt = datetime.fromisoformat(str(x))
-        except Exception:
-            dt = datetime.now(timezone.utc)
+        return _as_utc(x)  # the harvester hands these over already parsed
+    dt = _parse_iso_utc(x if isinstance(x, str) else str(x))
+    return dt if dt is not None else datetime.now(timezone.utc)
+
 
-    # Ensure tz-aware (UTC)
+# boards repeat the same timestamps across postings; datetimes are immutable.
+# Unparseable strings are cached too (as None); the now() fallback is applied
+# in _parse_ts, outside the cache, so it stays fresh.
+@lru_cache(maxsize=8192)
+def _parse_iso_utc(s: str) -> Optional[datetime]:
+    try:
+        return _as_utc(datetime.fromisoformat(s))  # C parser; takes a trailing "Z" on 3.11+
+    except ValueError:
+        return None
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # Allow timezone-naive; treat as UTC
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+        return dt.replace(tzinfo=timezone.utc)
+    return dt if dt.tzinfo is timezone.utc else dt.astimezone(timezone.utc)
 
 
-def _stable_fallback_fingerprint(company: str, title: str, location: str,
-                                 canonical_url: Optional[str], apply_url: Optional[str]) -> str:
+def _fallback_key(company: str, title: str, location: str,
+                  canonical_url: Optional[str], apply_url: Optional[str]) -> str:
     """
     When the description is empty/very short, we need an idempotent, stable hash
     that won't collapse everything to a single value.
     """
-    base = "|".join([
-        _first(company).lower(),
-        _first(title).lower(),
-        _first(location).lower(),
-        (canonical_url or "").strip().lower(),
-        (apply_url or "").strip().lower(),
-    ])
-    return simhash_text(base)
-
-
-def _choose_hash(description_md: str,
-                 company: str,
-                 title: str,
-                 location: str,
-                 canonical_url: Optional[str],
-                 apply_url: Optional[str]) -> str:
-    desc = (description_md or "").strip()
+    return "|".join((
+        _first(company),
+        _first(title),
+        _first(location),
+        _first(canonical_url),
+        _first(apply_url),
+    )).lower()
+
+
+def _hash_source(n: Dict[str, Any]) -> str:
+    """The text a normalized item is fingerprinted from."""
+    # _normalize already stripped description_md; don't copy a ~50KB blob again
+    desc = n["description_md"] or ""
     if len(desc) >= _MIN_DESC_FOR_SIMHASH:
-        return simhash_text(desc)
+        return desc
     # Fallback to a metadata-based fingerprint when description is thin
-    return _stable_fallback_fingerprint(company, title, location, canonical_url, apply_url)
+    return _fallback_key(n["company"], n["title"], n["location"],
+                         n.get("canonical_url"), n.get("apply_url"))
 
 
 def _normalize(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -87,38 +138,43 @@ def _normalize(raw: Dict[str, Any]) -> Dict[str, Any]:
     Normalize a raw scraper item into our Job columns. Be lenient with inputs.
     Required: company, title, posted_at, apply_url or canonical_url, description_md (can be short).
     """
-    company = _first(raw.get("company"))
-    title = _first(raw.get("title"))
-    location = _first(raw.get("location"))
-    remote = _first(raw.get("remote"))
-    employment_type = _first(raw.get("employment_type"))
-    level = _first(raw.get("level"))
+    # ~15 field reads per row on the ingest hot path: bind the lookups locally
+    get, first, num = raw.get, _first, _num_or_none
+    company = first(get("company"))
+    title = first(get("title"))
+    location = first(get("location"))
+    remote = first(get("remote"))
+    employment_type = first(get("employment_type"))
+    level = first(get("level"))
 
     # prefer canonical_url, then apply_url
-    canonical_url = _canon_url(raw.get("canonical_url")) or _canon_url(raw.get("apply_url"))
-    apply_url = _canon_url(raw.get("apply_url")) or canonical_url
+    apply_url = _canon_url(get("apply_url"))
+    canonical_url = _canon_url(get("canonical_url")) or apply_url
+    apply_url = apply_url or canonical_url
 
-    description_md = raw.get("description_md") or raw.get("description_raw") or ""
-    description_md = str(description_md or "").strip()
+    description_md = get("description_md") or get("description_raw") or ""
+    if not isinstance(description_md, str):
+        description_md = str(description_md)
+    description_md = description_md.strip()
 
     # posted_at
-    posted_at = _parse_ts(raw.get("posted_at"))
+    posted_at = _parse_ts(get("posted_at"))
 
     # salary
-    currency = _first(raw.get("currency"))
-    salary_min = _num_or_none(raw.get("salary_min"))
-    salary_max = _num_or_none(raw.get("salary_max"))
-    salary_period = _first(raw.get("salary_period"))
+    currency = first(get("currency"))
+    salary_min = num(get("salary_min"))
+    salary_max = num(get("salary_max"))
+    salary_period = first(get("salary_period"))
 
     # source tagging (e.g. "greenhouse:databricks")
-    source = _first(raw.get("source")) or "unknown"
+    source = first(get("source")) or "unknown"
 
-    meta = raw.get("meta") or {}
+    meta = get("meta") or {}
 
     return {
-        "source": source,
-        "company": company or "unknown",
-        "title": title or "(untitled)",
+        "source": _interned(source),
+        "company": _interned(company or "unknown"),
+        "title": _interned(title or "(untitled)"),
         "location": location or "",
         "remote": remote or "",
         "employment_type": employment_type or "",
@@ -131,182 +187,322 @@ def _normalize(raw: Dict[str, Any]) -> Dict[str, Any]:
         "salary_max": salary_max,
         "salary_period": salary_period or "",
         "description_md": description_md,
-        "description_raw": raw.get("description_raw") or None,
+        "description_raw": get("description_raw") or None,
         "meta": meta,
     }
 
 
-def _find_existing(db: Session, *,
-                   company: str,
-                   title: str,
-                   canonical_url: Optional[str],
-                   apply_url: Optional[str],
-                   hash_sim: str,
-                   posted_at: datetime) -> Optional[Job]:
+def fingerprint_items(items: List[Dict[str, Any]]) -> List[Optional[str]]:
     """
-    Try to find an existing job using progressively weaker keys:
-    1) canonical_url exact match
-    2) apply_url exact match
-    3) hash_sim + (company,title) within a recent window
+    The hash_sim upsert_jobs would compute for each raw item (None where it
+    doesn't normalize). Lets a caller fingerprint off the ingest thread, e.g.
+    in the harvester's parse pool, and pass the result in as item["hash_sim"].
     """
-    # 1) canonical_url
-    if canonical_url:
-        q = select(Job).where(Job.canonical_url == canonical_url)
-        row = db.execute(q).scalars().first()
-        if row:
-            return row
-
-    # 2) apply_url
-    if apply_url:
-        q = select(Job).where(Job.apply_url == apply_url)
-        row = db.execute(q).scalars().first()
-        if row:
-            return row
-
-    # 3) hash + company/title within window
-    cutoff = posted_at - timedelta(days=_RECENT_WINDOW_FOR_HASH_MATCH_DAYS)
-    q = (
-        select(Job)
-        .where(
-            and_(
-                Job.hash_sim == hash_sim,
-                Job.company.ilike(company),
-                Job.title.ilike(title),
-                Job.posted_at >= cutoff,
-            )
-        )
-        .order_by(Job.posted_at.desc())
-    )
-    return db.execute(q).scalars().first()
+    rows: List[Optional[Dict[str, Any]]] = []
+    for raw in items:
+        try:
+            rows.append(_normalize(raw))
+        except Exception:
+            rows.append(None)
+    hashes = iter(simhash_batch([_hash_source(n) for n in rows if n is not None]))
+    return [None if n is None else next(hashes) for n in rows]
 
 
-def upsert_jobs(db: Session, items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+def _merge_changes(cur: Dict[str, Any], n: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Ingest a batch of normalized or raw items into the DB with robust idempotency.
-    Returns counters: seen, inserted, updated, skipped_dupe, errors.
+    The fields of normalized item `n` that improve on `cur`: a newer posted_at,
+    a longer description, and backfills of fields `cur` is missing. Same rules
+    as the hash_sim ON CONFLICT merge (_MERGE_SET).
     """
-    seen = inserted = updated = skipped = errors = 0
+    changes: Dict[str, Any] = {}
+    if n["posted_at"] and cur["posted_at"] and n["posted_at"] > cur["posted_at"]:
+        changes["posted_at"] = n["posted_at"]
+    new_desc = n["description_md"] or ""
+    if new_desc and len(new_desc) > len(cur["description_md"] or ""):
+        changes["description_md"] = new_desc
+    for fld in _BACKFILL_TEXT:
+        if not cur[fld] and n.get(fld):
+            changes[fld] = n[fld]
+    for fld in ("salary_min", "salary_max"):
+        if cur[fld] is None and n.get(fld) is not None:
+            changes[fld] = n[fld]
+    return changes
+
+
+# Ingest statements are built once per process, not per batch: each execution
+# then only binds parameters, and the engine's compiled cache is hit on the
+# first lookup without rebuilding (and re-keying) the construct every time.
+_URLS = bindparam("urls", type_=ARRAY(Text))
+_BY_URL = select(Job).where(or_(Job.canonical_url == any_(_URLS), Job.apply_url == any_(_URLS)))
+_HASHES = bindparam("hashes", type_=ARRAY(Text))
+_IDENTITY_BY_HASH = select(Job.hash_sim, Job.company, Job.title).where(Job.hash_sim == any_(_HASHES))
+
+# Core table insert: rows are plain dicts and never read back as objects,
+# so skip ORM bulk-insert bookkeeping; Job.id's uuid4 default still applies
+_JOBS = Job.__table__
+_INSERT_MERGE = (
+    pg_insert(_JOBS)
+    .on_conflict_do_update(
+        index_elements=[_JOBS.c.hash_sim],
+        set_={c: literal_column(e) for c, e in _MERGE_SET.items()},
+        where=text(_MERGE_WHERE),
+    )
+    .returning(_JOBS.c.id, _JOBS.c.hash_sim, literal_column("(xmax = 0)").label("inserted"))
+)
 
-    batch: List[Job] = []
 
-    for raw in items:
-        seen += 1
-        try:
-            n = _normalize(raw)
-
-            # compute a robust hash
-            h = _choose_hash(
-                n["description_md"],
-                n["company"],
-                n["title"],
-                n["location"],
-                n.get("canonical_url"),
-                n.get("apply_url"),
+def _existing_by_url(
+    db: Session, urls: Set[str]
+) -> Tuple[Dict[str, Job], Dict[str, Job]]:
+    """
+    Load every job whose canonical_url or apply_url is in `urls` with one
+    `= ANY(:urls)` query (a single array bind, not N probes), indexed both ways:
+    (by canonical_url, by apply_url).
+    Exact hash_sim duplicates need no probe: the insert's ON CONFLICT merges them.
+    """
+    by_canonical: Dict[str, Job] = {}
+    by_apply: Dict[str, Job] = {}
+    if not urls:
+        return by_canonical, by_apply
+    for row in db.execute(_BY_URL, {"urls": list(urls)}).scalars():
+        if row.canonical_url:
+            by_canonical.setdefault(row.canonical_url, row)
+        if row.apply_url:
+            by_apply.setdefault(row.apply_url, row)
+    return by_canonical, by_apply
+
+
+def _identity_conflicts(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Count (and log) buffered rows that hit ON CONFLICT (hash_sim) against a stored
+    posting with a different company or title. Such rows are folded into the
+    stored one by the merge, keeping its company/title; only called for rows the
+    insert did not create, so it costs a query only when something conflicted.
+    """
+    stored = {h: (c, t) for h, c, t in db.execute(
+        _IDENTITY_BY_HASH, {"hashes": [r["hash_sim"] for r in rows]}
+    )}
+    clashes = 0
+    for r in rows:
+        ident = stored.get(r["hash_sim"])
+        if ident is not None and ident != (r["company"], r["title"]):
+            clashes += 1
+            log.warning(
+                "hash_sim %s of %s / %s merged into stored %s / %s",
+                r["hash_sim"], r["company"], r["title"], *ident,
+                extra={"source": r["source"], "apply_url": r["apply_url"]},
             )
+    return clashes
 
-            # Try to find an existing record
-            existing = _find_existing(
-                db,
-                company=n["company"],
-                title=n["title"],
-                canonical_url=n.get("canonical_url"),
-                apply_url=n.get("apply_url"),
-                hash_sim=h,
-                posted_at=n["posted_at"],
-            )
 
-            if existing:
-                # Optionally refresh fields when new data is better/newer
-                changed = False
-
-                # Prefer newer posted_at
-                if n["posted_at"] and existing.posted_at and n["posted_at"] > existing.posted_at:
-                    existing.posted_at = n["posted_at"]
-                    changed = True
-
-                # Prefer longer/better description
-                new_desc = n["description_md"] or ""
-                if new_desc and len(new_desc) > len(existing.description_md or ""):
-                    existing.description_md = new_desc
-                    changed = True
-
-                # Backfill canonical_url/apply_url if missing
-                if (not existing.canonical_url) and n.get("canonical_url"):
-                    existing.canonical_url = n["canonical_url"]
-                    changed = True
-                if (not existing.apply_url) and n.get("apply_url"):
-                    existing.apply_url = n["apply_url"]
-                    changed = True
-
-                # Currency/salary backfill
-                if (not existing.currency) and n.get("currency"):
-                    existing.currency = n["currency"]
-                    changed = True
-                if (existing.salary_min is None) and (n.get("salary_min") is not None):
-                    existing.salary_min = n["salary_min"]
-                    changed = True
-                if (existing.salary_max is None) and (n.get("salary_max") is not None):
-                    existing.salary_max = n["salary_max"]
-                    changed = True
-                if (not existing.salary_period) and n.get("salary_period"):
-                    existing.salary_period = n["salary_period"]
-                    changed = True
-
-                # Location/level/employment type backfill
-                for fld in ("location", "level", "employment_type", "remote"):
-                    if not getattr(existing, fld) and n.get(fld):
-                        setattr(existing, fld, n[fld])
-                        changed = True
-
-                if changed:
-                    updated += 1
-                else:
-                    skipped += 1
+def _insert_new(db: Session, rows: List[Dict[str, Any]]) -> List[Tuple[Any, str, bool]]:
+    """
+    One INSERT ... ON CONFLICT (hash_sim) DO UPDATE ... RETURNING for the buffered
+    rows (hashes are unique within a batch: upsert_jobs dedupes them first).
+    Returns (id, hash_sim, inserted) for every row inserted or merged; conflicts
+    the merge leaves unchanged are not returned.
+    """
+    return [tuple(r) for r in db.execute(_INSERT_MERGE, rows)]
 
-                # flush periodically
-                if (inserted + updated) % 100 == 0:
-                    db.flush()
 
-                continue
+def _copy_new(db: Session, rows: List[Dict[str, Any]]) -> List[Tuple[Any, str, bool]]:
+    """
+    Same contract as _insert_new, for large batches on psycopg 3: COPY the rows
+    into a temp stage table, then move them over with a single
+    INSERT ... SELECT ... ON CONFLICT (hash_sim) DO UPDATE ... RETURNING.
+    """
+    cols = list(rows[0])
+    col_list = ", ".join(["id", *cols])
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cur:
+        # LIKE without INCLUDING GENERATED: search_vec is a plain column here
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS jobs_stage "
+            "(LIKE jobs INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cur.execute("TRUNCATE jobs_stage")
+        with cur.copy(f"COPY jobs_stage ({col_list}) FROM STDIN") as copy:
+            for r in rows:
+                copy.write_row(
+                    [uuid.uuid4()]
+                    + [Json(r[c]) if c == "meta" else r[c] for c in cols]
+                )
+        cur.execute(
+            f"INSERT INTO jobs ({col_list}) SELECT {col_list} FROM jobs_stage "
+            "ON CONFLICT (hash_sim) DO UPDATE SET "
+            + ", ".join(f"{c} = {e}" for c, e in _MERGE_SET.items())
+            + f" WHERE {_MERGE_WHERE} RETURNING {_MERGE_RETURNING}"
+        )
+        return [tuple(r) for r in cur.fetchall()]
 
-            # Insert new row
-            job = Job(
-                source=n["source"],
-                company=n["company"],
-                title=n["title"],
-                location=n["location"],
-                remote=n["remote"],
-                employment_type=n["employment_type"],
-                level=n["level"],
-                posted_at=n["posted_at"],
-                apply_url=n["apply_url"],
-                canonical_url=n["canonical_url"],
-                currency=n["currency"],
-                salary_min=n["salary_min"],
-                salary_max=n["salary_max"],
-                salary_period=n["salary_period"],
-                description_md=n["description_md"],
-                description_raw=n.get("description_raw"),
-                hash_sim=h,
-                meta=n.get("meta") or {},
-            )
-            db.add(job)
-            inserted += 1
 
-            if (inserted + updated) % 100 == 0:
-                db.flush()
+def _can_copy(db: Session, n: int) -> bool:
+    return n >= _COPY_MIN_ROWS and db.get_bind().dialect.driver == "psycopg"
 
-        except Exception:
-            errors += 1
-            # keep moving
+
+def upsert_jobs(
+    db: Session,
+    items: Iterable[Dict[str, Any]],
+    seen_hashes: Optional[Set[str]] = None,
+) -> Dict[str, int]:
+    """
+    Ingest a batch of normalized or raw items into the DB with robust idempotency.
+    `seen_hashes` lets a caller share in-memory dedupe across several batches
+    (e.g. one harvest sweep); hashes already in it are skipped without a DB probe.
+    `items` may be a generator: it is consumed _INSERT_BATCH items at a time.
+    Returns counters: seen, inserted, updated, skipped_dupe, errors, and conflicts
+    (rows merged by fingerprint into a posting with another company/title; these
+    are also counted in updated or skipped_dupe).
+    """
+    seen = inserted = updated = skipped = errors = conflicts = 0
+    if seen_hashes is None:
+        seen_hashes = set()
+
+    pending: List[Dict[str, Any]] = []
+    # pending rows by URL, so later items in the batch see them without a query
+    queued_canonical: Dict[str, Dict[str, Any]] = {}
+    queued_apply: Dict[str, Dict[str, Any]] = {}
+    # (id, title, description) of inserted rows, embedded after the commit
+    to_embed: List[Tuple[str, str, str]] = []
+    want_embeddings = embeddings_enabled()
+
+    def flush_pending() -> None:
+        nonlocal inserted, updated, skipped, errors, conflicts
+        if not pending:
+            return
+        # savepoint: a failing batch (e.g. a NOT NULL violation) doesn't poison
+        # the updates already made in this transaction
+        try:
+            with db.begin_nested():
+                if _can_copy(db, len(pending)):
+                    new = _copy_new(db, pending)
+                else:
+                    new = _insert_new(db, pending)
+                fresh = [(job_id, h) for job_id, h, is_new in new if is_new]
+                clashes = 0
+                if len(fresh) < len(pending):
+                    created = {h for _, h in fresh}
+                    clashes = _identity_conflicts(
+                        db, [r for r in pending if r["hash_sim"] not in created]
+                    )
+            inserted += len(fresh)
+            updated += len(new) - len(fresh)
+            skipped += len(pending) - len(new)
+            conflicts += clashes
+            if want_embeddings:
+                by_hash = {r["hash_sim"]: r for r in pending}
+                to_embed.extend(
+                    (str(job_id), by_hash[h]["title"], by_hash[h]["description_md"])
+                    for job_id, h in fresh
+                )
+        except (SQLAlchemyError, psycopg.Error):
+            errors += len(pending)
+        pending.clear()
+        queued_canonical.clear()
+        queued_apply.clear()
+
+    # fixed-size chunks: a generator over a large dump is never materialized,
+    # and each chunk's rows are released before the next one is read
+    it = iter(items)
+    while chunk := list(islice(it, _INSERT_BATCH)):
+        rows: List[Dict[str, Any]] = []
+        hashes: List[Optional[str]] = []  # caller-supplied (fingerprint_items) where present
+        for raw in chunk:
+            seen += 1
+            try:
+                rows.append(_normalize(raw))
+                hashes.append(raw.get("hash_sim"))
+            except Exception:
+                errors += 1
+
+        # fingerprint the rest of the chunk at once: postings from one board share
+        # most of their boilerplate, and simhash_batch hashes each shingle only once
+        missing = [i for i, h in enumerate(hashes) if not h]
+        if missing:
+            for i, h in zip(missing, simhash_batch([_hash_source(rows[i]) for i in missing])):
+                hashes[i] = h
+
+        # one round-trip for the URL matches of the whole chunk
+        by_canonical, by_apply = _existing_by_url(db, {
+            u for n, h in zip(rows, hashes) if h not in seen_hashes
+            for u in (n.get("canonical_url"), n.get("apply_url")) if u
+        })
+
+        for n, h in zip(rows, hashes):
+            # the same posting often shows up twice in one sweep (several boards/sources)
+            if h in seen_hashes:
+                skipped += 1
+                continue
+            seen_hashes.add(h)
+            try:
+                # Try to find an existing record: canonical_url first, then apply_url
+                existing = (
+                    by_canonical.get(n.get("canonical_url") or "")
+                    or by_apply.get(n.get("apply_url") or "")
+                )
+
+                if existing:
+                    # Optionally refresh fields when new data is better/newer
+                    changes = _merge_changes({f: getattr(existing, f) for f in _MERGE_SET}, n)
+                    for fld, value in changes.items():
+                        setattr(existing, fld, value)
+
+                    if changes:
+                        updated += 1
+                    else:
+                        skipped += 1
+
+                    # flush periodically
+                    if (inserted + updated) % 100 == 0:
+                        db.flush()
+
+                    continue
+
+                # Same URL as a row already buffered in this batch (different text,
+                # so a different hash): fold it into that row instead of a second insert
+                queued = (
+                    queued_canonical.get(n.get("canonical_url") or "")
+                    or queued_apply.get(n.get("apply_url") or "")
+                )
+                if queued is not None:
+                    queued.update(_merge_changes(queued, n))
+                    skipped += 1
+                    continue
+
+                # New row: _normalize already built a fresh dict of exactly the Job
+                # columns (meta defaulted), so buffer it as-is rather than copying it
+                n["hash_sim"] = h
+                pending.append(n)
+                if n["canonical_url"]:
+                    queued_canonical.setdefault(n["canonical_url"], n)
+                if n["apply_url"]:
+                    queued_apply.setdefault(n["apply_url"], n)
+
+            except Exception:
+                errors += 1
+                # per item, so high-error boards can be hot: only pay for the record
+                # (and the traceback) when someone is actually listening at DEBUG
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("ingest failed for %s", n.get("apply_url"), exc_info=True,
+                              extra={"source": n.get("source"), "hash_sim": h})
+                # keep moving
+
+        flush_pending()
+        # matched rows were updated in place: write them out, then drop them
+        # (descriptions and all) from the identity map
+        db.flush()
+        db.expunge_all()
 
     db.commit()
+    # outside the ingest transaction: a slow embedding call holds no row locks
+    upsert_job_embeddings_batch(db, to_embed)
     return {
         "seen": seen,
         "inserted": inserted,
         "updated": updated,
         "skipped_dupe": skipped,
         "errors": errors,
+        "conflicts": conflicts,
     }
 
 
@@ -321,13 +517,8 @@ def delete_older_than_hours(cutoff: datetime) -> int:
         cutoff = cutoff.replace(tzinfo=timezone.utc)
     cutoff = cutoff.astimezone(timezone.utc)
 
-    from sqlalchemy import delete
-    stmt = delete(Job).where(Job.posted_at < cutoff)
-    with db_transaction() as (db, commit):
-        res = db.execute(stmt)
-        commit()
-        # res.rowcount may be None in some drivers; normalize to int
-        return int(res.rowcount or 0)
+    from app.services.cleanup import delete_before
+    return delete_before(cutoff)
 
 
 # Small context helper to make delete_older_than_hours work standalone if used elsewhere
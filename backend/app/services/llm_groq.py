@@ -1,9 +1,12 @@
 # backend/app/services/llm_groq.py
 from __future__ import annotations
+import heapq
 import os
-from typing import List, Dict, Any, Tuple, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Tuple, Optional
 
 import httpx
+import orjson
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
@@ -24,9 +27,6 @@ def _as_dict(msg: Any) -> Dict[str, str]:
 def _normalize_messages(messages: List[Any]) -> List[Dict[str, str]]:
     return [_as_dict(m) for m in messages]
 
-def _len_msgs(messages: List[Dict[str, str]]) -> int:
-    return sum(len(m.get("content", "")) for m in messages)
-
 def _shrink_text(s: str, keep: int) -> str:
     if len(s) <= keep:
         return s
@@ -35,61 +35,132 @@ def _shrink_text(s: str, keep: int) -> str:
     return s[:head] + "\n...\n[TRIMMED]\n...\n" + s[-tail:]
 
 def _shrink_messages(messages: List[Dict[str, str]], budget: int) -> Tuple[List[Dict[str, str]], bool]:
-    total = _len_msgs(messages)
+    sizes = [len(m.get("content", "")) for m in messages]
+    total = sum(sizes)
     if total <= budget:
         return messages, False
-    sizes = [len(m.get("content", "")) for m in messages]
-    total_sizes = sum(sizes) or 1
-    per_budget = [max(500, (sizes[i] * budget) // total_sizes) for i in range(len(messages))]
+    orig, total = total, 0
     new_msgs: List[Dict[str, str]] = []
-    for i, msg in enumerate(messages):
-        content = msg.get("content", "")
-        keep_n = per_budget[i]
-        new_msgs.append({"role": msg.get("role", "user"), "content": _shrink_text(content, keep_n)})
-    while _len_msgs(new_msgs) > budget:
-        i = max(range(len(new_msgs)), key=lambda k: len(new_msgs[k].get("content", "")))
-        c = new_msgs[i].get("content", "")
-        if len(c) <= 1000:
+    for msg, size in zip(messages, sizes):
+        content = _shrink_text(msg.get("content", ""), max(500, (size * budget) // orig))
+        new_msgs.append({"role": msg.get("role", "user"), "content": content})
+        total += len(content)
+    # keep trimming the largest message; lengths tracked in a heap and a running
+    # total instead of re-summing every message per step
+    heap = [(-len(m["content"]), i) for i, m in enumerate(new_msgs)]
+    heapq.heapify(heap)
+    while total > budget:
+        size, i = -heap[0][0], heap[0][1]
+        if size <= 1000:
             break
-        new_msgs[i]["content"] = _shrink_text(c, len(c) - 1000)
+        c = _shrink_text(new_msgs[i]["content"], size - 1000)
+        new_msgs[i]["content"] = c
+        total += len(c) - size
+        heapq.heapreplace(heap, (-len(c), i))
     return new_msgs, True
 
+_DEFAULT_CLIENT: Optional[httpx.AsyncClient] = None
+
+def _default_client() -> httpx.AsyncClient:
+    # module-level GroqLLM()s (cover_letter, the groq_client shim) have no app
+    # client: share one HTTP/2 keep-alive pool rather than a TLS handshake per call
+    global _DEFAULT_CLIENT
+    if _DEFAULT_CLIENT is None or _DEFAULT_CLIENT.is_closed:
+        _DEFAULT_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=90,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _DEFAULT_CLIENT
+
+async def _iter_deltas(r: httpx.Response) -> AsyncIterator[str]:
+    if r.is_error:
+        await r.aread()
+    r.raise_for_status()
+    async for line in r.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        chunk = orjson.loads(data)
+        delta = ((chunk.get("choices") or [{}])[0].get("delta") or {}).get("content")
+        if delta:
+            yield delta
+
 class GroqLLM:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         if not GROQ_API_KEY:
             raise RuntimeError("GROQ_API_KEY not set")
         self._headers = {
             "Authorization": f"Bearer {GROQ_API_KEY}",
             "Content-Type": "application/json",
         }
+        # shared app-level client (keep-alive pool); falls back to a process-wide one
+        self._shared = client
 
-    async def chat(
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        yield self._shared if self._shared is not None else _default_client()
+
+    def _payload(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.2,
-        response_format: Optional[Dict[str, str]] = None,
-    ) -> str:
-        msgs = _normalize_messages(messages)
-        total = _len_msgs(msgs)
-        if total > MAX_TOTAL_CHARS:
-            msgs, _ = _shrink_messages(msgs, MAX_TOTAL_CHARS)
+        temperature: float,
+        response_format: Optional[Dict[str, str]],
+        stream: bool,
+    ) -> Dict[str, Any]:
+        # no-op (one length pass) when the prompt already fits
+        msgs, _ = _shrink_messages(_normalize_messages(messages), MAX_TOTAL_CHARS)
 
         payload: Dict[str, Any] = {
             "model": GROQ_MODEL,
             "temperature": temperature,
             "messages": msgs,
-            "stream": False,
+            "stream": stream,
             "max_tokens": MAX_TOKENS,
         }
         if response_format:
             payload["response_format"] = response_format  # OpenAI-compatible
+        return payload
 
-        async with httpx.AsyncClient(timeout=90) as c:
-            r = await c.post(_API_URL, headers=self._headers, json=payload)
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> str:
+        payload = self._payload(messages, temperature, response_format, stream=False)
+
+        async with self._client() as c:
+            r = await c.post(_API_URL, headers=self._headers, json=payload, timeout=90)
             if r.status_code == 413:
                 tighter_msgs, _ = _shrink_messages(_normalize_messages(messages), MIN_TOTAL_CHARS)
                 tighter_payload = dict(payload, messages=tighter_msgs)
-                r = await c.post(_API_URL, headers=self._headers, json=tighter_payload)
+                r = await c.post(_API_URL, headers=self._headers, json=tighter_payload, timeout=90)
             r.raise_for_status()
             data = r.json()
             return data["choices"][0]["message"]["content"]
+
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[str]:
+        """Yield content deltas as Groq produces them (OpenAI-style SSE)."""
+        payload = self._payload(messages, temperature, response_format, stream=True)
+
+        async with self._client() as c:
+            async with c.stream("POST", _API_URL, headers=self._headers, json=payload, timeout=90) as r:
+                if r.status_code != 413:
+                    async for delta in _iter_deltas(r):
+                        yield delta
+                    return
+            tighter_msgs, _ = _shrink_messages(_normalize_messages(messages), MIN_TOTAL_CHARS)
+            tighter_payload = dict(payload, messages=tighter_msgs)
+            async with c.stream(
+                "POST", _API_URL, headers=self._headers, json=tighter_payload, timeout=90
+            ) as r:
+                async for delta in _iter_deltas(r):
+                    yield delta
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.db import SessionLocal
 from app.models import Job
 from app.services.dedupe import simhash_text
+from app.services.jobs import upsert_jobs
 
 @shared_task
 def ingest_job(payload: dict):
@@ -18,3 +19,14 @@ def ingest_job(payload: dict):
         return str(job.id)
     finally:
         db.close()
+
+@shared_task(acks_late=True)
+def ingest_jobs_bulk(payloads: list[dict]) -> dict:
+    """
+    Batched variant of ingest_job: one transaction and batched INSERT/COPY via
+    upsert_jobs instead of a message + commit per job. Fan large sets out as
+    group(ingest_jobs_bulk.s(payloads[i:i + 200]) for i in range(0, n, 200)).
+    Returns upsert_jobs' counters.
+    """
+    with SessionLocal() as db:
+        return upsert_jobs(db, payloads)
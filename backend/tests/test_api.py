@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.routers import analyze, chat, cover_letters, harvest, jobs, llm, parse_resume
 
 client = TestClient(app)
 
@@ -7,3 +8,19 @@ client = TestClient(app)
 def test_health():
     r = client.get('/healthz')
     assert r.status_code == 200
+
+
+def test_no_duplicate_or_shadowed_routes():
+    routes = [
+        r
+        for mod in (llm, jobs, analyze, cover_letters, harvest, chat, parse_resume)
+        for r in mod.router.routes
+    ]
+    for i, early in enumerate(routes):
+        for late in routes[i + 1:]:
+            if not (early.methods & late.methods):
+                continue
+            assert early.path != late.path, f"duplicate route {late.methods} {late.path}"
+            assert not early.path_regex.match(late.path), (
+                f"{late.path} is shadowed by earlier {early.path}"
+            )
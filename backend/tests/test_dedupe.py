@@ -0,0 +1,41 @@
+import pytest
+from simhash import Simhash
+
+from app.services.dedupe import is_dup, simhash_batch, simhash_text
+
+# hash_sim is a unique key over rows fingerprinted by Simhash(text) before
+# simhash_batch existed: the batch path must reproduce it bit for bit
+TEXTS = [
+    "",
+    "a",
+    "abcd",
+    "Hi!",
+    "   ",
+    "Senior Python Engineer - Remote (US). We're hiring & growing fast.",
+    "Ingénieur logiciel à Paris — Straße, Ångström, naïve café",
+    "数据工程师 北京 远程 Python Spark 经验丰富",
+    "Backend 🚀 engineer, team 👩‍💻 loves emoji 𝔘𝔫𝔦𝔠𝔬𝔡𝔢",
+    "𝒜𝒷",
+    "mixed 日本語 text with ascii and 🙂 astral",
+    "lorem ipsum dolor sit amet " * 8,
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_simhash_text_matches_simhash(text):
+    assert int(simhash_text(text), 16) == Simhash(text).value
+
+
+def test_simhash_batch_matches_per_text():
+    # boilerplate shared across one batch: the same shingles repeat across rows
+    boiler = "About us: we build job tools. Benefits: health, dental, 401k. "
+    batch = TEXTS + [boiler + t for t in TEXTS] + [boiler, boiler]
+    got = simhash_batch(batch)
+    assert got == [simhash_text(t) for t in batch]
+    assert [int(h, 16) for h in got] == [Simhash(t).value for t in batch]
+
+
+def test_is_dup():
+    h = simhash_text("Senior Python Engineer, remote")
+    assert is_dup(h, h)
+    assert not is_dup(h, hex(int(h, 16) ^ 0b11111), hamming_thresh=4)
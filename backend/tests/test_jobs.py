@@ -0,0 +1,157 @@
+import uuid
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import jobs as J
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _row(**kw):
+    # a normalized item / stored row with every merge field present
+    n = J._normalize({
+        "company": "Acme", "title": "Engineer", "posted_at": T0,
+        "apply_url": "http://acme/1", "description_md": "short text", "source": "t",
+    })
+    n.update(kw)
+    return n
+
+
+def test_merge_changes_newer_posted_at_only():
+    cur = _row()
+    assert J._merge_changes(cur, _row(posted_at=T0 + timedelta(days=1))) == {
+        "posted_at": T0 + timedelta(days=1)
+    }
+    assert J._merge_changes(cur, _row(posted_at=T0 - timedelta(days=1))) == {}
+
+
+def test_merge_changes_longer_description_only():
+    cur = _row(description_md="a fairly long description")
+    assert J._merge_changes(cur, _row(description_md="shorter")) == {}
+    longer = "a fairly long description, now with benefits"
+    assert J._merge_changes(cur, _row(description_md=longer)) == {"description_md": longer}
+
+
+def test_merge_changes_backfills_only_empty_fields():
+    cur = _row(location="NYC", currency="", salary_min=None, salary_max=100.0)
+    new = _row(location="Berlin", currency="EUR", level="Senior",
+               salary_min=50.0, salary_max=200.0)
+    assert J._merge_changes(cur, new) == {
+        "currency": "EUR", "level": "Senior", "salary_min": 50.0,
+    }
+
+
+def test_normalize_defaults_and_url_fallback():
+    n = J._normalize({"company": "  Acme ", "title": None, "posted_at": "2026-10-01T00:00:00Z",
+                      "apply_url": " http://acme/1 ", "description_md": "  hi  "})
+    assert n["company"] == "Acme"
+    assert n["title"] == "(untitled)"
+    assert n["source"] == "unknown"
+    assert n["apply_url"] == n["canonical_url"] == "http://acme/1"
+    assert n["description_md"] == "hi"
+    assert n["posted_at"] == T0
+    assert n["location"] == "" and n["salary_min"] is None and n["meta"] == {}
+
+
+class FakeSession:
+    """
+    Just enough Session for upsert_jobs: stored rows by hash_sim, with the
+    ON CONFLICT (hash_sim) merge applied by _insert_new below.
+    """
+
+    def __init__(self, stored):
+        self.by_hash = {r["hash_sim"]: r for r in stored}
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def flush(self):
+        pass
+
+    def expunge_all(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def execute(self, stmt, params):
+        assert stmt is J._IDENTITY_BY_HASH
+        return [(h, self.by_hash[h]["company"], self.by_hash[h]["title"])
+                for h in params["hashes"] if h in self.by_hash]
+
+
+def _fake_insert(db, rows):
+    out = []
+    for r in rows:
+        cur = db.by_hash.get(r["hash_sim"])
+        if cur is None:
+            db.by_hash[r["hash_sim"]] = dict(r, id=uuid.uuid4())
+            out.append((db.by_hash[r["hash_sim"]]["id"], r["hash_sim"], True))
+            continue
+        changes = J._merge_changes(cur, r)
+        if changes:  # unchanged conflicts are filtered by the merge's WHERE
+            cur.update(changes)
+            out.append((cur["id"], r["hash_sim"], False))
+    return out
+
+
+def _fake_by_url(db, urls):
+    rows = [SimpleNamespace(**r) for r in db.by_hash.values()]
+    return ({r.canonical_url: r for r in rows if r.canonical_url in urls},
+            {r.apply_url: r for r in rows if r.apply_url in urls})
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    monkeypatch.setattr(J, "_insert_new", _fake_insert)
+    monkeypatch.setattr(J, "_can_copy", lambda db, n: False)
+    monkeypatch.setattr(J, "_existing_by_url", _fake_by_url)
+    monkeypatch.setattr(J, "embeddings_enabled", lambda: False)
+    monkeypatch.setattr(J, "upsert_job_embeddings_batch", lambda db, rows: None)
+    return J.upsert_jobs
+
+
+def _item(h, **kw):
+    d = {"company": "Acme", "title": "Engineer", "posted_at": T0, "source": "t",
+         "apply_url": f"http://acme/{h}", "description_md": f"posting {h}", "hash_sim": h}
+    d.update(kw)
+    return d
+
+
+def test_upsert_jobs_accounting(ingest):
+    stored = [
+        dict(_row(**{k: v for k, v in _item("s1").items() if k != "hash_sim"}),
+             hash_sim="s1", id=uuid.uuid4()),
+        dict(_row(**{k: v for k, v in _item("s2").items() if k != "hash_sim"}),
+             hash_sim="s2", id=uuid.uuid4()),
+        dict(_row(company="Other Co", title="Designer", apply_url="http://other/1",
+                  canonical_url="http://other/1"), hash_sim="s3", id=uuid.uuid4()),
+    ]
+    db = FakeSession(stored)
+    res = ingest(db, [
+        _item("n1"),                                          # new row
+        _item("n1"),                                          # same hash again
+        _item("n2", apply_url="http://acme/n1", currency="USD"),  # same URL as n1
+        _item("x1", apply_url="http://acme/s1",
+              posted_at=T0 + timedelta(days=1)),              # URL match, newer
+        _item("x2", apply_url="http://acme/s2"),              # URL match, nothing new
+        _item("s3", apply_url="http://acme/s3",
+              description_md="a much longer description than before"),  # other company
+        None,                                                 # not a mapping
+    ])
+    assert res == {"seen": 7, "inserted": 1, "updated": 2, "skipped_dupe": 3,
+                   "errors": 1, "conflicts": 1}
+    # folded into n1's buffered row instead of a second insert
+    assert db.by_hash["n1"]["currency"] == "USD" and "n2" not in db.by_hash
+    # merged by hash into the stored posting: its company/title win
+    assert db.by_hash["s3"]["company"] == "Other Co"
+
+
+def test_upsert_jobs_unchanged_hash_conflict_is_still_counted(ingest):
+    stored = [dict(_row(company="Other Co", apply_url="http://other/1",
+                        canonical_url="http://other/1"), hash_sim="h", id=uuid.uuid4())]
+    res = ingest(FakeSession(stored), [_item("h", description_md="short text")])
+    assert res["skipped_dupe"] == 1 and res["conflicts"] == 1 and res["inserted"] == 0
@@ -5,24 +5,36 @@ from scrapy import signals
 from scrapy.exceptions import NotConfigured
 from scrapy.http import Request
 
+# A-Z/a-z rotated by 13 places, every other byte left as is
+_ROT13 = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
+    b"NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm",
+)
+_CACHE_MAX = 8192  # distinct header values kept; cleared wholesale when full
+
 class ROT13Middleware:
-    def __init__(self, enabled=False):
-        self.enabled = enabled
+    def __init__(self):
+        # the header is usually set statically upstream: the same few values
+        # repeat across every request of a crawl
+        self._cache: dict[bytes, bytes] = {}
 
     @classmethod
     def from_crawler(cls, crawler):
-        enabled = crawler.settings.getbool("ROT13_MIDDLEWARE_ENABLED", False)
-        if not enabled:
+        # only instantiated when enabled, so process_request needs no flag check
+        if not crawler.settings.getbool("ROT13_MIDDLEWARE_ENABLED", False):
             raise NotConfigured
-        return cls(enabled)
+        return cls()
 
     def process_request(self, request: Request, spider):
         # Example: add a ROT13 encoded header to requests
-        if self.enabled:
-            headers = request.headers or {}
-            header = headers.get(b"X-Rot13", b"")
-            if header:
-                decoded = base64.b64decode(header).decode()
-                rotated = decoded[::13]
-                headers[b"X-Rot13"] = rotated.encode()
-        return
+        # most requests carry no header: one lookup, no default/fallback objects
+        header = request.headers.get(b"X-Rot13")
+        if not header:
+            return
+        out = self._cache.get(header)
+        if out is None:
+            if len(self._cache) >= _CACHE_MAX:
+                self._cache.clear()
+            # stays bytes end to end: no str round-trip, one table pass
+            out = self._cache[header] = base64.b64decode(header).translate(_ROT13)
+        request.headers[b"X-Rot13"] = out
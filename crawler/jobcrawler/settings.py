@@ -4,6 +4,15 @@ SPIDER_MODULES = ["jobcrawler.spiders"]
 NEWSPIDER_MODULE = "jobcrawler.spiders"
 USER_AGENT = os.getenv("CRAWLER_USER_AGENT","JobScoutAgentBot/1.0")
 ROBOTSTXT_OBEY = os.getenv("CRAWL_RESPECT_ROBOTS","true").lower() == "true"
-CONCURRENT_REQUESTS = 8
-DOWNLOAD_DELAY = 0.25
+CONCURRENT_REQUESTS = int(os.getenv("CRAWLER_CONCURRENCY","32"))
+CONCURRENT_REQUESTS_PER_DOMAIN = int(os.getenv("CRAWLER_CONCURRENCY_PER_DOMAIN","16"))
+DOWNLOAD_DELAY = float(os.getenv("CRAWLER_DOWNLOAD_DELAY","0"))
+REACTOR_THREADPOOL_MAXSIZE = int(os.getenv("CRAWLER_THREADPOOL","20"))
+# backs off per domain on slow/erroring responses instead of a fixed delay
+AUTOTHROTTLE_ENABLED = os.getenv("CRAWLER_AUTOTHROTTLE","true").lower() == "true"
+AUTOTHROTTLE_TARGET_CONCURRENCY = float(os.getenv("CRAWLER_AUTOTHROTTLE_TARGET","8"))
+# Scrapy's HTTP/1.1 handler already pools keep-alive connections per host;
+# HTTP/2 additionally multiplexes them (experimental in Scrapy: no proxy support)
+if os.getenv("CRAWLER_HTTP2","false").lower() == "true":
+    DOWNLOAD_HANDLERS = {"https": "scrapy.core.downloader.handlers.http2.H2DownloadHandler"}
 ITEM_PIPELINES = {"jobcrawler.pipelines.RestSink": 300}
@@ -1 +1 @@
-CREATE EXTENSION IF NOT EXISTS vector;\n\n-- Canonical jobs table\nCREATE TABLE IF NOT EXISTS jobs (\n  id UUID PRIMARY KEY,\n  source TEXT NOT NULL,\n  company TEXT NOT NULL,\n  title TEXT NOT NULL,\n  location TEXT,\n  remote TEXT,\n  employment_type TEXT,\n  level TEXT,\n  posted_at TIMESTAMPTZ NOT NULL,\n  apply_url TEXT NOT NULL,\n  canonical_url TEXT,\n  currency TEXT,\n  salary_min NUMERIC,\n  salary_max NUMERIC,\n  salary_period TEXT,\n  description_md TEXT NOT NULL,\n  description_raw TEXT,\n  hash_sim TEXT NOT NULL,\n  meta JSONB,\n  created_at TIMESTAMPTZ DEFAULT now()\n);\n\n-- Analyses\nCREATE TABLE IF NOT EXISTS job_analyses (\n  id UUID PRIMARY KEY,\n  job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,\n  resume_version TEXT,\n  fit_score INT CHECK (fit_score BETWEEN 0 AND 100),\n  strengths JSONB,\n  gaps JSONB,\n  ats_keywords JSONB,\n  rationale TEXT,\n  created_at TIMESTAMPTZ DEFAULT now()\n);\n\n-- Cover letters\nCREATE TABLE IF NOT EXISTS cover_letters (\n  id UUID PRIMARY KEY,\n  job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,\n  resume_version TEXT,\n  variant TEXT CHECK (variant IN ('short','standard','long')) DEFAULT 'standard',\n  tone TEXT,\n  letter_md TEXT,\n  created_at TIMESTAMPTZ DEFAULT now(),\n  user_edited BOOLEAN DEFAULT FALSE\n);\n\n-- Embeddings (pgvector)\nCREATE TABLE IF NOT EXISTS job_embeddings (\n  job_id UUID PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,\n  title_vec vector(1536),\n  desc_vec  vector(1536)\n);\nCREATE INDEX IF NOT EXISTS idx_job_title_vec ON job_embeddings USING ivfflat (title_vec);\nCREATE INDEX IF NOT EXISTS idx_job_desc_vec  ON job_embeddings USING ivfflat (desc_vec);
\ No newline at end of file
+CREATE EXTENSION IF NOT EXISTS vector;\n\n-- Canonical jobs table\nCREATE TABLE IF NOT EXISTS jobs (\n  id UUID PRIMARY KEY,\n  source TEXT NOT NULL,\n  company TEXT NOT NULL,\n  title TEXT NOT NULL,\n  location TEXT,\n  remote TEXT,\n  employment_type TEXT,\n  level TEXT,\n  posted_at TIMESTAMPTZ NOT NULL,\n  apply_url TEXT NOT NULL,\n  canonical_url TEXT,\n  currency TEXT,\n  salary_min NUMERIC,\n  salary_max NUMERIC,\n  salary_period TEXT,\n  description_md TEXT NOT NULL,\n  description_raw TEXT,\n  hash_sim TEXT NOT NULL,\n  meta JSONB,\n  created_at TIMESTAMPTZ DEFAULT now()\n);\n\n-- Manual ingests may omit posted_at\nALTER TABLE jobs ALTER COLUMN posted_at SET DEFAULT now();\n\nCREATE INDEX IF NOT EXISTS ix_jobs_posted_at_desc ON jobs (posted_at DESC);\n-- plain (not partial) indexes: ingest writes '' rather than NULL for a missing\n-- remote/level, and a parameterized remote = $1 couldn't prove a <> '' predicate\nCREATE INDEX IF NOT EXISTS ix_jobs_remote ON jobs (remote);\nCREATE INDEX IF NOT EXISTS ix_jobs_level ON jobs (level);\n-- ingest matches postings to existing rows by URL (one ANY(array) probe per batch)\nCREATE INDEX IF NOT EXISTS ix_jobs_canonical_url ON jobs (canonical_url);\nCREATE INDEX IF NOT EXISTS ix_jobs_apply_url ON jobs (apply_url);\n\n-- Full-text search over title/company/description (queried with plainto_tsquery)\nALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vec tsvector GENERATED ALWAYS AS (\n  to_tsvector('english', coalesce(title,'') || ' ' || coalesce(company,'') || ' ' || coalesce(description_md,''))\n) STORED;\nCREATE INDEX IF NOT EXISTS ix_jobs_fts ON jobs USING GIN (search_vec);\n\n-- Trigram index backs the substring ILIKE filter on location\nCREATE EXTENSION IF NOT EXISTS pg_trgm;\nCREATE INDEX IF NOT EXISTS ix_jobs_location_trgm ON jobs USING GIN (location gin_trgm_ops);\n\n-- Analyses\nCREATE TABLE IF NOT EXISTS job_analyses (\n  id UUID PRIMARY KEY,\n  job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,\n  resume_version TEXT,\n  fit_score INT CHECK (fit_score BETWEEN 0 AND 100),\n  strengths JSONB,\n  gaps JSONB,\n  ats_keywords JSONB,\n  rationale TEXT,\n  created_at TIMESTAMPTZ DEFAULT now()\n);\n\n-- Cover letters\nCREATE TABLE IF NOT EXISTS cover_letters (\n  id UUID PRIMARY KEY,\n  job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,\n  resume_version TEXT,\n  variant TEXT CHECK (variant IN ('short','standard','long')) DEFAULT 'standard',\n  tone TEXT,\n  letter_md TEXT,\n  created_at TIMESTAMPTZ DEFAULT now(),\n  user_edited BOOLEAN DEFAULT FALSE\n);\n\n-- Embeddings (pgvector)\nCREATE TABLE IF NOT EXISTS job_embeddings (\n  job_id UUID PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,\n  title_vec vector(1536),\n  desc_vec  vector(1536)\n);\nCREATE INDEX IF NOT EXISTS idx_job_title_vec ON job_embeddings USING ivfflat (title_vec);\nCREATE INDEX IF NOT EXISTS idx_job_desc_vec  ON job_embeddings USING ivfflat (desc_vec);\n\n-- Dedupe key; ingest relies on it for ON CONFLICT (hash_sim).\n-- Databases filled by the old ingest can hold several rows per hash_sim (it\n-- raced its probe, and matched on hash + company/title): keep the newest row\n-- of each hash, move analyses/letters onto it, then build the index. Runs\n-- after the dependent tables exist; one transaction, so a failure leaves the\n-- rows untouched instead of silently skipping the index.\nBEGIN;\nCREATE TEMP TABLE jobs_hash_dupes ON COMMIT DROP AS\n  SELECT id, keep_id FROM (\n    SELECT id, first_value(id) OVER (\n      PARTITION BY hash_sim ORDER BY posted_at DESC, created_at DESC NULLS LAST, id\n    ) AS keep_id\n    FROM jobs\n  ) ranked\n  WHERE id <> keep_id;\nUPDATE job_analyses a SET job_id = d.keep_id FROM jobs_hash_dupes d WHERE a.job_id = d.id;\nUPDATE cover_letters c SET job_id = d.keep_id FROM jobs_hash_dupes d WHERE c.job_id = d.id;\nDELETE FROM jobs j USING jobs_hash_dupes d WHERE j.id = d.id;  -- embeddings cascade\nCREATE UNIQUE INDEX IF NOT EXISTS ix_jobs_hash_sim ON jobs (hash_sim);\nCOMMIT;
\ No newline at end of file